@@ -1,10 +1,35 @@
+import argparse
 import json
+import bz2
 import csv
+import glob
+import gzip
+import hashlib
+import io
+import lzma
+import mmap
+import multiprocessing
 import pickle
+import queue
 import os
 import sys
+import tempfile
 import re
-from datetime import datetime
+import sqlite3
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+
+# Columns of the CSV output, the pickle rows use the same order
+HEADER = [
+    "Row #", "issue", "Pull Request", "issue text", "issue description",
+    "pull request text", "pull request description", "created_at", "closed_at", "userlogin", "author_name",
+    "comments", "files_changed", "commit_hashes", "newest_commit_hash"
+]
 
 #----------------------------------------------------------------------------------------------------------------------
 # Function to clean text by replacing newline characters with spaces
@@ -27,20 +52,64 @@ def clean_text(text):
 # Output - two lists, one of issues and another of keywords
 # Written by Adonijah Farner
 # ----------------------------------------------------------------------------------------------------------------------
+LINKED_ISSUE_KEYWORDS = [
+    "closes", "fixes", "resolves", "in", "solves",
+    "addresses", "completes", "connects", "related to", "reverts",
+    "implements", "references", "incorporates", "updates", "handles",
+    "patches", "adds", "modifies", "enhances", "improves", "adjusts"
+]
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Modified to scan the body once for issue references and check which keywords end right before each one,
+# instead of running a separate regex over the body for every keyword
+# Date: 10/17/2026
+# ----------------------------------------------------------------------------------------------------------------------
+# An issue reference preceded by the single space that follows a keyword. References never contain spaces,
+# so every candidate is found by one non-overlapping scan.
+_ISSUE_REFERENCE_PATTERN = re.compile(r' (#\d+|https://github\.com/\S+/issues/\d+)', re.IGNORECASE)
+_KEYWORD_POSITIONS = {keyword: position for position, keyword in enumerate(LINKED_ISSUE_KEYWORDS)}
+_KEYWORD_LENGTHS = sorted({len(keyword) for keyword in LINKED_ISSUE_KEYWORDS})
+_KEYWORD_PATTERNS = [
+    (position, len(keyword), re.compile(re.escape(keyword), re.IGNORECASE))
+    for position, keyword in enumerate(LINKED_ISSUE_KEYWORDS)
+]
+
+
+def _keywords_ending_at(body_text, end):
+    """Return the positions in LINKED_ISSUE_KEYWORDS of every keyword that ends at index end of body_text."""
+    tail = body_text[max(0, end - _KEYWORD_LENGTHS[-1]):end]
+    if not tail.isascii():
+        # Non-ASCII letters can match a keyword case-insensitively (e.g. the long s), so let re decide
+        return [position for position, length, keyword_pattern in _KEYWORD_PATTERNS
+                if length <= end and keyword_pattern.fullmatch(body_text, end - length, end)]
+
+    tail = tail.lower()
+    positions = []
+    for length in _KEYWORD_LENGTHS:
+        if length > len(tail):
+            break
+        position = _KEYWORD_POSITIONS.get(tail[-length:])
+        if position is not None:
+            positions.append(position)
+    return positions
+
+
 def find_linked_issues(body_text):
-    keywords = [
-        "closes", "fixes", "resolves", "in", "solves",
-        "addresses", "completes", "connects", "related to", "reverts",
-        "implements", "references", "incorporates", "updates", "handles",
-        "patches", "adds", "modifies", "enhances", "improves", "adjusts"
-    ]
+    matches_by_keyword = None
+
+    for reference in _ISSUE_REFERENCE_PATTERN.finditer(body_text):
+        for position in _keywords_ending_at(body_text, reference.start()):
+            if matches_by_keyword is None:
+                matches_by_keyword = [[] for _ in LINKED_ISSUE_KEYWORDS]
+            matches_by_keyword[position].append(reference.group(1))
+
     linked_issues = []
     description_keywords = []
+    if matches_by_keyword is None:
+        return linked_issues, description_keywords
 
-    for keyword in keywords:
-        pattern = fr'{keyword} (#\d+|https://github\.com/\S+/issues/\d+)'
-        matches = re.findall(pattern, body_text, re.IGNORECASE)
-
+    # Keep the original order: grouped by keyword, then by position in the body
+    for keyword, matches in zip(LINKED_ISSUE_KEYWORDS, matches_by_keyword):
         for match in matches:
             linked_issues.append(match)
             description_keywords.append(keyword)
@@ -50,33 +119,129 @@ def find_linked_issues(body_text):
 # End of function find_linked_issues
 # ----------------------------------------------------------------------------------------------------------------------
 
+#----------------------------------------------------------------------------------------------------------------------
+# Function to parse a GitHub commit timestamp
+# Input - commit_date: a string such as "2024-05-15T13:45:00Z"
+# Output - the number of seconds since 1970-01-01T00:00:00Z, which sorts the same way as the timestamps;
+#          raises ValueError when the string is not a valid timestamp
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+COMMIT_DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def parse_commit_date(commit_date):
+    """Convert a GitHub timestamp to epoch seconds, using strptime only for strings off the fixed layout."""
+    if (len(commit_date) == 20 and commit_date[4] == "-" and commit_date[7] == "-" and commit_date[10] == "T"
+            and commit_date[13] == ":" and commit_date[16] == ":" and commit_date[19] == "Z"):
+        digits = (commit_date[0:4] + commit_date[5:7] + commit_date[8:10]
+                  + commit_date[11:13] + commit_date[14:16] + commit_date[17:19])
+        if digits.isascii() and digits.isdigit():
+            # The datetime constructor rejects out of range fields (month 13, February 30, second 60) like strptime
+            date = datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                            int(digits[8:10]), int(digits[10:12]), int(digits[12:14]))
+        else:
+            date = datetime.strptime(commit_date, COMMIT_DATE_FORMAT)
+    else:
+        # strptime also accepts looser variants, such as single digit months
+        date = datetime.strptime(commit_date, COMMIT_DATE_FORMAT)
+    return ((date.toordinal() - _EPOCH_ORDINAL) * 86400
+            + date.hour * 3600 + date.minute * 60 + date.second)
+#----------------------------------------------------------------------------------------------------------------------
+# End of function parse_commit_date
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to format a commit date parsed by parse_commit_date
+# Input - commit_epoch: the number of seconds since 1970-01-01T00:00:00Z
+# Output - a timestamp string such as "2024-05-15T13:45:00Z"
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def format_commit_date(commit_epoch):
+    return time.strftime(COMMIT_DATE_FORMAT, time.gmtime(commit_epoch))
+#----------------------------------------------------------------------------------------------------------------------
+# End of function format_commit_date
+#----------------------------------------------------------------------------------------------------------------------
+
 #----------------------------------------------------------------------------------------------------------------------
 # Function to extract data from a pull request (PR) dictionary
 # Input - pr: a dictionary representing a pull request
-# Output - a dictionary with cleaned and structured data from the PR
+#         fields: an optional set of the PRRecord fields that are needed, see column_fields
+# Output - a PRRecord with cleaned and structured data from the PR
 # Written by Adonijah Farner
 # Modified to include created_at, closed_at, userlogin, author_name, comments, and files_changed
 # Date: 5/15/2024
+# Modified to return a compact PRRecord instead of a dictionary, keeping the list fields as lists
+# Date: 10/17/2026
+# Modified to keep the parsed date, sha and author of each commit in the record
+# Date: 10/17/2026
+# Modified to skip the body and linked issues, the comments, or the commits and files when none of the fields
+# made from them are needed; those fields are then left empty
+# Date: 10/17/2026
+# Modified to keep the commits of each PR only when fields asks for them, as the SQLite and side tables do
+# Date: 10/17/2026
 #----------------------------------------------------------------------------------------------------------------------
-def extract_data(pr):
-    body_text = clean_text(pr.get("body", ""))
-    linked_issues, description_keywords = find_linked_issues(body_text)
-
-    data = {
-        "issue": clean_text(pr.get("title", "")),
-        "Pull Request": pr.get("is_pr", ""),
-        "issue text": " | ".join(linked_issues),
-        "issue description": " | ".join(description_keywords),
-        "pull request text": clean_text(pr.get("title", "")),
-        "pull request description": clean_text(pr.get("body", "")),
-        #----------------------------------------------------------------------------------------------------------------------
-        # Modified to include created_at, closed_at, and userlogin fields
-        # Date: 5/15/2024
-        #----------------------------------------------------------------------------------------------------------------------
-        "created_at": clean_text(pr.get("created_at", "")),
-        "closed_at": clean_text(pr.get("closed_at", "")),
-        "userlogin": clean_text(pr.get("userlogin", "")),
-    }
+# One extracted PR. The list fields (linked_issues, description_keywords, comments, files_changed and
+# commit_hashes) are lists of strings; they are only joined when a CSV row is written. commits holds a
+# (date in epoch seconds, sha, author_name) tuple for each dated commit, newest first, for the SQLite tables;
+# it is only filled in when "commits" is in fields, since the CSV and pickle rows already have commit_hashes.
+PRRecord = namedtuple("PRRecord", [
+    "title", "is_pr", "linked_issues", "description_keywords", "body", "created_at", "closed_at",
+    "userlogin", "author_name", "comments", "files_changed", "commit_hashes", "newest_commit_hash", "commits"
+])
+# Every field, including commits, for the SQLite database and side tables
+ALL_FIELDS = frozenset(PRRecord._fields)
+
+# The PRRecord fields each column of HEADER is made from
+COLUMN_FIELDS = {
+    "Row #": (), "issue": (), "Pull Request": ("is_pr",), "issue text": ("linked_issues",),
+    "issue description": ("description_keywords",), "pull request text": ("title",),
+    "pull request description": ("body",), "created_at": ("created_at",), "closed_at": ("closed_at",),
+    "userlogin": ("userlogin",), "author_name": ("author_name",), "comments": ("comments",),
+    "files_changed": ("files_changed",), "commit_hashes": ("commit_hashes",),
+    "newest_commit_hash": ("newest_commit_hash",),
+}
+# The fields extract_data only computes when one of them is needed, and the PR keys they are read from
+_LINKED_ISSUE_FIELDS = frozenset(["linked_issues", "description_keywords"])
+_BODY_FIELDS = _LINKED_ISSUE_FIELDS | {"body"}
+_COMMIT_FIELDS = frozenset(["author_name", "files_changed", "commit_hashes", "newest_commit_hash", "commits"])
+_KEY_FIELDS = {"body": _BODY_FIELDS, "comments": frozenset(["comments"]), "commits": _COMMIT_FIELDS}
+
+
+def column_fields(columns):
+    """Return the set of PRRecord fields needed for the given HEADER columns, or None for every column."""
+    if columns is None:
+        return None
+    unknown = [column for column in columns if column not in COLUMN_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown columns {', '.join(unknown)}; the columns are {', '.join(HEADER)}")
+    return frozenset(field for column in columns for field in COLUMN_FIELDS[column])
+
+
+def skipped_keys(fields):
+    """Return the PR keys that can be dropped as soon as each PR is read when only fields are extracted."""
+    if fields is None:
+        return None
+    return frozenset(key for key, key_fields in _KEY_FIELDS.items() if fields.isdisjoint(key_fields))
+
+
+def extract_data(pr, fields=None):
+    body_text = ""
+    linked_issues, description_keywords = [], []
+    if fields is None or not fields.isdisjoint(_BODY_FIELDS):
+        body_text = clean_text(pr.get("body", ""))
+        if fields is None or not fields.isdisjoint(_LINKED_ISSUE_FIELDS):
+            linked_issues, description_keywords = find_linked_issues(body_text)
+
+    title = clean_text(pr.get("title", ""))
+    is_pr = pr.get("is_pr", "")
+    #----------------------------------------------------------------------------------------------------------------------
+    # Modified to include created_at, closed_at, and userlogin fields
+    # Date: 5/15/2024
+    #----------------------------------------------------------------------------------------------------------------------
+    created_at = clean_text(pr.get("created_at", ""))
+    closed_at = clean_text(pr.get("closed_at", ""))
+    userlogin = clean_text(pr.get("userlogin", ""))
 
     # ----------------------------------------------------------------------------------------------------------------------
     # Modified to include concatenated list of comments
@@ -85,13 +250,12 @@ def extract_data(pr):
     # ----------------------------------------------------------------------------------------------------------------------
     # Process comments
     comments = []
-    if pr.get("comments"):
+    if (fields is None or "comments" in fields) and pr.get("comments"):
         # print(f"Processing comments for PR: {pr}")
         for comment in pr["comments"].values():
             body = clean_text(comment.get("body", ""))
             # print(f"Found comment body: {body}")
             comments.append(body)
-    data["comments"] = " | ".join(comments)
 
     # ----------------------------------------------------------------------------------------------------------------------
     # Modified to include concatenated list of files changed
@@ -100,15 +264,14 @@ def extract_data(pr):
     # ----------------------------------------------------------------------------------------------------------------------
     # Collect files changed across all commits
     files_changed = []
-    commit_hashes = []
     commits = []
-    if pr.get("commits"):
+    if (fields is None or not fields.isdisjoint(_COMMIT_FIELDS)) and pr.get("commits"):
         for commit in pr["commits"].values():
             commit_date = commit.get("date", "")
             if commit_date:  # Only parse if commit_date is not empty
                 try:
-                    commit_date_obj = datetime.strptime(commit_date, "%Y-%m-%dT%H:%M:%SZ")
-                    commits.append((commit_date_obj, commit.get("sha", ""), commit.get("author_name", "")))
+                    commit_epoch = parse_commit_date(commit_date)
+                    commits.append((commit_epoch, commit.get("sha", ""), commit.get("author_name", "")))
                 except ValueError:
                     continue  # Skip this commit if the date is invalid
             files = commit.get("files", {})
@@ -119,136 +282,2222 @@ def extract_data(pr):
     commits.sort(key=lambda x: x[0], reverse=True)
     sorted_commit_hashes = [commit[1] for commit in commits]
     newest_commit_hash = sorted_commit_hashes[0] if sorted_commit_hashes else ""
+    author_name = commits[0][2] if commits else ""  # Use the author of the newest commit
 
-    data["files_changed"] = " | ".join(files_changed)
-    data["commit_hashes"] = " | ".join(sorted_commit_hashes)
-    data["newest_commit_hash"] = newest_commit_hash
-    if commits:
-        data["author_name"] = commits[0][2]  # Use the author of the newest commit
-
-    return data
+    if fields is None or "commits" not in fields:
+        commits = []
+    return PRRecord(title, is_pr, linked_issues, description_keywords, body_text, created_at, closed_at,
+                    userlogin, author_name, comments, files_changed, sorted_commit_hashes, newest_commit_hash, commits)
 #----------------------------------------------------------------------------------------------------------------------
 # End of function extract_data
 #----------------------------------------------------------------------------------------------------------------------
 
 #----------------------------------------------------------------------------------------------------------------------
-# Function to convert JSON data to a specified pickle format and save it
-# Input - data: a dictionary containing pull request data
-#         pickle_file: the name of the output pickle file
-# Output - a pickle file with the processed pull request data
+# Functions and class to read and write files that may be gzip, xz or bz2 compressed
+# Input - filename: the file name; a .gz, .xz or .bz2 suffix selects the compression
+#         mode: 'r' or 'w' for text (UTF-8, no newline translation), 'rb' or 'wb' for bytes
+# Output - a file object. Compressed output files are compressed on a background thread, so compression
+#          overlaps with the extraction running on the main thread.
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+COMPRESSED_OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+COMPRESSION_SUFFIXES = {"gz": ".gz", "xz": ".xz", "bz2": ".bz2"}
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def compression_suffix(filename):
+    """Return the compression suffix of filename (".gz", ".xz" or ".bz2"), or "" when it is not compressed."""
+    suffix = os.path.splitext(filename)[1].lower()
+    return suffix if suffix in COMPRESSED_OPENERS else ""
+
+
+class BackgroundCompressor(io.RawIOBase):
+    """A binary file whose writes are compressed and saved by a background thread."""
+
+    def __init__(self, filename):
+        super().__init__()
+        self._file = COMPRESSED_OPENERS[compression_suffix(filename)](filename, 'wb')
+        # A few buffers in flight keep the compressor busy while bounding memory
+        self._queue = queue.Queue(maxsize=8)
+        self._error = None
+        self._thread = threading.Thread(target=self._compress, name=f"compress {filename}", daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def _compress(self):
+        # zlib, lzma and bz2 release the GIL while they compress
+        while True:
+            data = self._queue.get()
+            if data is None:
+                break
+            if self._error is None:
+                try:
+                    self._file.write(data)
+                except Exception as e:
+                    self._error = e
+        try:
+            self._file.close()
+        except Exception as e:
+            self._error = self._error or e
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            super().close()
+            if self._error is not None:
+                raise self._error
+
+
+def open_input(filename, mode='r'):
+    """Open a possibly compressed file for reading."""
+    suffix = compression_suffix(filename)
+    if mode == 'r':
+        if suffix:
+            return COMPRESSED_OPENERS[suffix](filename, 'rt', encoding='utf-8', newline='')
+        return open(filename, 'r', newline='', encoding='utf-8')
+    if suffix:
+        return COMPRESSED_OPENERS[suffix](filename, 'rb')
+    return open(filename, 'rb')
+
+
+def open_output(filename, mode='w'):
+    """Open a possibly compressed file for writing, compressing on a background thread."""
+    if not compression_suffix(filename):
+        if mode == 'w':
+            return open(filename, 'w', newline='', encoding='utf-8')
+        return open(filename, 'wb')
+    binary = io.BufferedWriter(BackgroundCompressor(filename), buffer_size=OUTPUT_BUFFER_SIZE)
+    if mode == 'w':
+        return io.TextIOWrapper(binary, encoding='utf-8', newline='')
+    return binary
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for compressed files
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function and class to run the reading and the writing of a conversion on threads of their own
+# Input - iterable: the items to read ahead, such as the (pr_id, pr) pairs of iter_json_object
+#         write: a function to call with the arguments of every BackgroundWriter.write
+#         queue_size: the number of batches that may wait between two stages before the faster one blocks
+#         batch_size: the number of items handed between the stages at a time
+# Output - iter_prefetched yields the items of iterable, produced ahead on a background thread; a BackgroundWriter
+#          calls write on its own thread. Both keep at most queue_size batches in flight, so memory stays bounded.
+#          File reads and writes and (de)compression release the GIL, so they may overlap with the extraction, but
+#          on a single CPU the threads only added handover costs and no gain has been measured with several CPUs,
+#          so the pipeline is off unless use_pipeline() (or --pipeline) turns it on.
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+PIPELINE = False
+PIPELINE_QUEUE_SIZE = 8
+PIPELINE_BATCH_SIZE = 256
+_END_OF_ITEMS = object()
+
+
+def use_pipeline(enabled=True):
+    """Choose whether conversions read and write on background threads while the PRs are extracted."""
+    global PIPELINE
+    PIPELINE = enabled
+
+
+def iter_prefetched(iterable, queue_size=PIPELINE_QUEUE_SIZE, batch_size=PIPELINE_BATCH_SIZE):
+    """Yield the items of iterable, produced ahead on a background thread through a bounded queue."""
+    batches = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def produce():
+        iterator = iter(iterable)
+        batch = []
+        try:
+            for item in iterator:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    batches.put(batch)
+                    if stop.is_set():
+                        return
+                    batch = []
+            batches.put(batch)
+            batches.put(_END_OF_ITEMS)
+        except BaseException as e:
+            # The items read before the error are still handed over, as they would be without the thread
+            batches.put(batch)
+            batches.put(e)
+        finally:
+            # A generator has to be closed by the thread running it, e.g. to close the file it reads
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    thread = threading.Thread(target=produce, name="read ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _END_OF_ITEMS:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+    finally:
+        # When the items stop being consumed early, let the producer finish its current put and stop
+        stop.set()
+        while thread.is_alive():
+            try:
+                batches.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+
+class BackgroundWriter:
+    """Call a write function on a background thread, with the calls handed over in batches."""
+
+    def __init__(self, write, name, queue_size=PIPELINE_QUEUE_SIZE, batch_size=PIPELINE_BATCH_SIZE):
+        self._write = write
+        self._batch = []
+        self._batch_size = batch_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def write(self, *args):
+        self._batch.append(args)
+        if len(self._batch) >= self._batch_size:
+            if self._error is not None:
+                raise self._error
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def _run(self):
+        write = self._write
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            if self._error is None:
+                try:
+                    for args in batch:
+                        write(*args)
+                except Exception as e:
+                    self._error = e
+
+    def close(self):
+        if self._thread.is_alive():
+            if self._batch:
+                self._queue.put(self._batch)
+                self._batch = []
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of function and class for the conversion pipeline
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to select PRs by their creation date, author and PR flag before they are extracted
+# Input - since, until: optional created_at bounds, "2024-01-01" or "2024-01-01T12:00:00Z" (any ISO 8601 date or
+#                       time; without an offset it is taken as UTC); since is inclusive and until exclusive. Both
+#                       are normalized to GitHub's "YYYY-MM-DDTHH:MM:SSZ" layout and compared as text, as it sorts.
+#         prs_only: True to keep only the entries whose is_pr is true
+#         users: an optional collection of userlogin values to keep
+# Output - make_pr_filter returns a PRFilter, or None when nothing is filtered; accepts_pr tells whether a raw PR
+#          dictionary passes it
+# Date: 10/17/2026
+# Modified to normalize the date bounds to the layout of created_at, converting offsets to UTC
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+PRFilter = namedtuple("PRFilter", ["since", "until", "prs_only", "users"])
+# Stands in for the value of an entry a PRFilter rejected. JSON never produces it, and it stays the same object
+# when it is pickled for a worker process.
+FILTERED_OUT = Ellipsis
+
+
+def normalize_date_bound(bound):
+    """Return an ISO date or timestamp as a UTC "YYYY-MM-DDTHH:MM:SSZ" string; raise ValueError for anything else."""
+    moment = datetime.fromisoformat(bound[:-1] + "+00:00" if bound.endswith("Z") else bound)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    if moment.microsecond:
+        # created_at has whole seconds, so a bound between two seconds selects the same PRs as the next second
+        moment = moment.replace(microsecond=0) + timedelta(seconds=1)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_pr_filter(since=None, until=None, prs_only=False, users=None):
+    """Return a PRFilter for the given conditions, or None when there are none."""
+    if since is not None:
+        since = normalize_date_bound(since)
+    if until is not None:
+        until = normalize_date_bound(until)
+    if since is None and until is None and not prs_only and not users:
+        return None
+    return PRFilter(since, until, bool(prs_only), frozenset(users) if users else None)
+
+
+def accepts_pr(pr_filter, pr):
+    """Return True when the raw PR dictionary pr passes pr_filter."""
+    if not isinstance(pr, dict):
+        return False
+    if pr_filter.since is not None or pr_filter.until is not None:
+        created_at = pr.get("created_at")
+        if not isinstance(created_at, str) or not created_at:
+            return False
+        if pr_filter.since is not None and created_at < pr_filter.since:
+            return False
+        if pr_filter.until is not None and created_at >= pr_filter.until:
+            return False
+    if pr_filter.prs_only and not pr.get("is_pr"):
+        return False
+    if pr_filter.users is not None and pr.get("userlogin") not in pr_filter.users:
+        return False
+    return True
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for filtering PRs
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to stream the entries of a top-level JSON object one at a time
+# Input - f: a text file object positioned at the start of a JSON object ({pr_id: pr, ...})
+#         chunk_size: the number of characters to read from the file at a time
+#         digests: an optional {key: (length, digest)} dictionary from text_digest of a previous read
+#         skip_keys: an optional set of keys to leave out of every value that is an object, such as "comments"
+#         pr_filter: an optional PRFilter; the values it rejects come back as FILTERED_OUT
+#         spans: True to report where the text of each value is in the file
+# Output - a generator of (key, value) pairs, each value decoded only when it is reached. With digests, a
+#          generator of (key, value, length, digest) tuples instead, where length and digest describe the
+#          JSON text of the value; a value whose text still matches its entry in digests is not decoded at
+#          all and comes back as None. With spans, a generator of (key, start, end) tuples, where the text
+#          of the value is f's characters from start up to end.
+# Date: 10/17/2026
+# Modified to report the length and digest of each value and skip decoding values that did not change
+# Date: 10/17/2026
+# Modified to drop skip_keys from each value as soon as it is decoded, so they are not kept or sent to workers
+# Date: 10/17/2026
+# Modified to apply a PRFilter to each value as soon as it is decoded
+# Date: 10/17/2026
+# Modified to report the position of each value in the file, for the byte-offset index
+# Date: 10/17/2026
+# Modified to report decoding errors at their position in the file and to read on past numbers cut by a chunk
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+READ_CHUNK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*')
+_DECODER = json.JSONDecoder()
+
+
+def _moved_decode_error(error, offset, lines, column):
+    """Return a JSONDecodeError from a buffer as it would read for the whole file the buffer started in."""
+    lineno = error.lineno + lines
+    colno = error.colno + column if error.lineno == 1 else error.colno
+    moved = json.JSONDecodeError(error.msg, error.doc, error.pos)
+    moved.pos, moved.lineno, moved.colno = error.pos + offset, lineno, colno
+    moved.args = (f"{error.msg}: line {lineno} column {colno} (char {moved.pos})",)
+    return moved
+
+
+def prepare_entry(value, skip_keys=None, pr_filter=None):
+    """Return a decoded entry without skip_keys, or FILTERED_OUT when pr_filter rejects it."""
+    if pr_filter is not None and not accepts_pr(pr_filter, value):
+        return FILTERED_OUT
+    if skip_keys and isinstance(value, dict):
+        for skip_key in skip_keys:
+            value.pop(skip_key, None)
+    return value
+
+
+def text_digest(text):
+    """Return a short digest identifying a piece of JSON text."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def iter_json_object(f, chunk_size=READ_CHUNK_SIZE, digests=None, skip_keys=None, pr_filter=None, spans=False):
+    """Yield (key, value) pairs from a top-level JSON object without loading the whole file."""
+    buf = ""
+    pos = 0
+    eof = False
+    value_start = 0
+    # The position in the file of the start of buf, and its line and column, for error messages
+    offset = 0
+    lines = 0
+    column = 0
+
+    def read_more(size):
+        # Drop the consumed part of the buffer and append the next chunk of the file
+        nonlocal buf, pos, eof, offset, lines, column
+        more = f.read(size)
+        offset += pos
+        newlines = buf.count("\n", 0, pos)
+        if newlines:
+            lines += newlines
+            column = pos - buf.rfind("\n", 0, pos) - 1
+        else:
+            column += pos
+        buf = buf[pos:] + more
+        pos = 0
+        eof = not more
+
+    def peek():
+        # Skip whitespace and return the next character, or "" at the end of the file
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            read_more(chunk_size)
+
+    def decode():
+        # Decode the value starting at pos, growing the buffer until the whole value is in it.
+        # A number followed by nothing but number characters up to the end of the buffer may be cut short
+        # (e.g. "-2." of "-2.5e10" decodes as -2), so read on.
+        nonlocal pos, value_start
+        while True:
+            value_start = pos
+            try:
+                value, end = _DECODER.raw_decode(buf, pos)
+                if eof or not (isinstance(value, (int, float)) and _NUMBER_TAIL.match(buf, end).end() == len(buf)):
+                    pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise _moved_decode_error(e, offset, lines, column) from None
+            read_more(max(chunk_size, len(buf) - pos))
+
+    def decode_value():
+        # Decode the next value, then filter it and leave out the keys that are not needed. The C decoder reads
+        # a whole value faster than the rest of it could be stepped over in Python, so both happen after decoding.
+        return prepare_entry(decode(), skip_keys, pr_filter)
+
+    def skip_unchanged(length, digest):
+        # Skip the value at pos if its text is the same as last time. The same text is the same complete
+        # value, as long as it cannot be a number cut short, so it does not need to be decoded again.
+        nonlocal pos
+        while len(buf) - pos < length and not eof:
+            read_more(max(chunk_size, length))
+        text = buf[pos:pos + length]
+        if len(text) < length or text[-1:] not in ('}', ']', '"') or text_digest(text) != digest:
+            return False
+        pos += length
+        return True
+
+    if peek() != "{":
+        raise ValueError("Expected a JSON object at the top level")
+    pos += 1
+    if peek() == "}":
+        return
+
+    while True:
+        if peek() != '"':
+            raise ValueError("Expected a string key in the top-level JSON object")
+        key = decode()
+        if peek() != ":":
+            raise ValueError(f"Expected ':' after key {key!r}")
+        pos += 1
+        peek()
+        if spans:
+            decode()
+            yield key, offset + value_start, offset + pos
+        elif digests is None:
+            yield key, decode_value()
+        else:
+            known = digests.get(key)
+            if known is not None and skip_unchanged(*known):
+                yield key, None, known[0], known[1]
+            else:
+                value = decode_value()
+                text = buf[value_start:pos]
+                yield key, value, len(text), text_digest(text)
+
+        char = peek()
+        if char == ",":
+            pos += 1
+        elif char == "}":
+            return
+        else:
+            raise ValueError(f"Expected ',' or '}}' after the value of key {key!r}")
+#----------------------------------------------------------------------------------------------------------------------
+# End of function iter_json_object
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to convert the extracted data of one PR to a CSV row
+# Input - idx: the row number of the PR
+#         pr_id: the id of the PR
+#         record: the PRRecord returned by extract_data for the PR
+# Output - a list with the PR data in the order of HEADER, with list fields joined by " | "
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def format_csv_row(idx, pr_id, record):
+    """Format one extracted PR into a CSV row."""
+    return [
+        idx,
+        pr_id,
+        record.is_pr,
+        " | ".join(record.linked_issues),
+        " | ".join(record.description_keywords),
+        record.title,
+        record.body,
+        record.created_at,
+        record.closed_at,
+        record.userlogin,
+        record.author_name,
+        " | ".join(record.comments),
+        " | ".join(record.files_changed),
+        " | ".join(record.commit_hashes),
+        record.newest_commit_hash
+    ]
+#----------------------------------------------------------------------------------------------------------------------
+# End of function format_csv_row
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to convert the extracted data of one PR to the specified pickle format
+# Input - idx: the row number of the PR
+#         pr_id: the id of the PR
+#         record: the PRRecord returned by extract_data for the PR
+# Output - a list with the PR data in the pickle row format
 # Written by Adonijah Farner
 # Date: 5/21/2024
+# Modified to format a single already extracted row, so extract_data runs once per PR for both outputs
+# Date: 10/17/2026
+# Modified to store the comments, files changed and commit hashes lists as extracted instead of splitting
+# the joined CSV text, which broke up entries containing " | " and turned empty lists into ['']
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def format_pickle_row(idx, pr_id, record):
+    """Format one extracted PR into the pickle row structure."""
+    return [
+        idx,
+        pr_id,
+        record.is_pr,
+        " | ".join(record.linked_issues),
+        " | ".join(record.description_keywords),
+        record.title,
+        record.body,
+        record.created_at,
+        record.closed_at,
+        record.userlogin,
+        record.author_name,
+        record.comments,
+        record.files_changed,
+        record.commit_hashes,
+        record.newest_commit_hash
+    ]
+#----------------------------------------------------------------------------------------------------------------------
+# End of function format_pickle_row
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Class to write the formatted pickle rows as they are produced
+# Input - pickle_file: the name of the output pickle file
+#         batch_size: the number of rows pickled together in one frame
+# Output - a pickle file holding a header frame followed by frames of up to batch_size rows each,
+#          readable with iter_pickle_rows
+# Written by Adonijah Farner
+# Date: 5/21/2024
+# Modified to write the rows in frames as they arrive instead of one pickle.dump of every row at the end
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+PICKLE_FORMAT_HEADER = ("ART-Mining PR rows", 1)
+PICKLE_BATCH_SIZE = 1000
+
+
+class PickleRowWriter:
+    """Write pickle rows to a file in frames of batch_size rows."""
+
+    def __init__(self, pickle_file, batch_size=PICKLE_BATCH_SIZE):
+        # ----------------------------------------------------------------------------------------------------------------------
+        # Modified to have pickle  file name match json file name
+        # Date: 6/10/2024
+        # Modified by Adonijah Farner
+        # ----------------------------------------------------------------------------------------------------------------------
+        self.pickle_file = pickle_file
+        self.batch_size = batch_size
+        self.batch = []
+        self.pf = open_output(pickle_file, 'wb')
+        pickle.dump(PICKLE_FORMAT_HEADER, self.pf)
+
+    def write(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            pickle.dump(self.batch, self.pf)
+            self.batch = []
+
+    def close(self):
+        if not self.pf.closed:
+            self.flush()
+            self.pf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of class PickleRowWriter
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to read the rows of a pickle file written by this script
+# Input - pickle_file: the name of the pickle file
+# Output - a generator of pickle rows, unpickling one frame at a time; files written before the framed
+#          format (a single pickled list of rows) are also accepted
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def iter_pickle_rows(pickle_file):
+    """Lazily yield the rows of a pickle file, so callers can stop early without loading it all."""
+    with open_input(pickle_file, 'rb') as pf:
+        first = pickle.load(pf)
+        if first != PICKLE_FORMAT_HEADER:
+            yield from first
+            return
+        while True:
+            try:
+                batch = pickle.load(pf)
+            except EOFError:
+                return
+            yield from batch
+#----------------------------------------------------------------------------------------------------------------------
+# End of function iter_pickle_rows
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function and class to write the list fields of the extracted PRs as side tables with one row per item
+# Input - idx: the row number of the PR
+#         pr_id: the id of the PR
+#         record: the PRRecord returned by extract_data for the PR
+#         csv_filename: for SideTableWriter, the name of the main CSV output the side tables go with
+# Output - explode_record returns the rows of the linked_issues, comments, commits and files tables for one PR,
+#          each row starting with idx, pr_id and the position of the item in its list. SideTableWriter writes the
+#          comments, commits and files rows to CSV files named after the main CSV, such as test.comments.csv.
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+SIDE_TABLE_HEADERS = {
+    "comments": ["Row #", "pr_id", "position", "comment"],
+    "commits": ["Row #", "pr_id", "position", "sha", "author_name", "date"],
+    "files": ["Row #", "pr_id", "position", "filename"],
+}
+SIDE_TABLE_BATCH_SIZE = 1000
+
+
+def explode_record(idx, pr_id, record):
+    """Return a {table: rows} dictionary with the linked issues, comments, commits and files of one PR."""
+    return {
+        "linked_issues": [(idx, pr_id, position, issue, keyword) for position, (issue, keyword)
+                          in enumerate(zip(record.linked_issues, record.description_keywords))],
+        "comments": [(idx, pr_id, position, body) for position, body in enumerate(record.comments)],
+        "commits": [(idx, pr_id, position, sha, author_name, format_commit_date(commit_epoch))
+                    for position, (commit_epoch, sha, author_name) in enumerate(record.commits)],
+        "files": [(idx, pr_id, position, filename) for position, filename in enumerate(record.files_changed)],
+    }
+
+
+def side_table_filenames(csv_filename):
+    """Return the side table file names that go with a CSV file, e.g. test.comments.csv.gz for test.csv.gz."""
+    suffix = compression_suffix(csv_filename)
+    base_name = os.path.splitext(csv_filename[:len(csv_filename) - len(suffix)])[0]
+    return {table: f"{base_name}.{table}.csv{suffix}" for table in SIDE_TABLE_HEADERS}
+
+
+class SideTableWriter:
+    """Write the comments, commits and files side tables of the extracted PRs as CSV files."""
+
+    def __init__(self, csv_filename, batch_size=SIDE_TABLE_BATCH_SIZE):
+        self.filenames = side_table_filenames(csv_filename)
+        self.batch_size = batch_size
+        self.pending = 0
+        self.batches = {table: [] for table in SIDE_TABLE_HEADERS}
+        self.files = {}
+        self.writers = {}
+        try:
+            for table, filename in self.filenames.items():
+                self.files[table] = open_output(filename)
+                self.writers[table] = csv.writer(self.files[table])
+                self.writers[table].writerow(SIDE_TABLE_HEADERS[table])
+        except Exception:
+            self.close()
+            raise
+
+    def write(self, idx, pr_id, record):
+        self.write_tables(explode_record(idx, pr_id, record))
+
+    def write_tables(self, tables):
+        """Add the rows explode_record returned for one PR."""
+        for table, rows in self.batches.items():
+            rows.extend(tables[table])
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # writerows over a whole batch costs far less than a writerow call per item
+        for table, rows in self.batches.items():
+            if rows:
+                self.writers[table].writerows(rows)
+                rows.clear()
+        self.pending = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for f in self.files.values():
+                f.close()
+            self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of function explode_record and class SideTableWriter
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Class to write the extracted PRs to a SQLite database
+# Input - database_file: the name of the output database, replaced when it already exists
+#         batch_size: the number of PRs inserted per transaction
+#         full_text: True to also build the pr_search full-text index, see search
+# Output - a SQLite database with one row per PR in the prs table and one row per list item, keyed by row_number,
+#          pr_id and position, in the linked_issues, comments, commits and files tables (pr_id alone is not unique
+#          in a database merged from several dumps). The rows are bulk inserted with executemany and the indexes
+#          are only built by close(), once every row is loaded.
+# Date: 10/17/2026
+# Modified to optionally build an FTS5 index over the titles, descriptions and comments
+# Date: 10/17/2026
 #----------------------------------------------------------------------------------------------------------------------
-def convert_to_pickle(data, pickle_file):
-    """Convert the JSON data to the specified pickle format and save it."""
-    # Create a list to store the converted data
-    pickle_data = []
+SQLITE_BATCH_SIZE = 10000
+SQLITE_TABLES = {
+    "prs": ["row_number INTEGER PRIMARY KEY", "pr_id TEXT", "is_pr", "title TEXT", "body TEXT", "created_at TEXT",
+            "closed_at TEXT", "userlogin TEXT", "author_name", "newest_commit_hash TEXT"],
+    "linked_issues": ["row_number INTEGER", "pr_id TEXT", "position INTEGER", "issue TEXT", "keyword TEXT"],
+    "comments": ["row_number INTEGER", "pr_id TEXT", "position INTEGER", "body TEXT"],
+    "commits": ["row_number INTEGER", "pr_id TEXT", "position INTEGER", "sha TEXT", "author_name", "date TEXT"],
+    "files": ["row_number INTEGER", "pr_id TEXT", "position INTEGER", "filename TEXT"],
+}
+SQLITE_INDEXES = [
+    ("prs", "pr_id"), ("linked_issues", "row_number"), ("comments", "row_number"), ("commits", "row_number"),
+    ("commits", "sha"), ("files", "row_number"), ("files", "filename"),
+]
+# The full-text index reads its text through the pr_text view instead of keeping a second copy of it
+SQLITE_FULL_TEXT = [
+    "CREATE VIEW pr_text AS SELECT row_number, title, body, "
+    "(SELECT group_concat(body, ' ') FROM (SELECT body FROM comments WHERE comments.row_number = prs.row_number "
+    "ORDER BY position)) AS comments FROM prs",
+    "CREATE VIRTUAL TABLE pr_search USING fts5(title, body, comments, content='pr_text', content_rowid='row_number')",
+    "INSERT INTO pr_search (pr_search) VALUES ('rebuild')",
+]
+
+
+def fts5_available():
+    """Return True when the sqlite3 module was built with the FTS5 extension."""
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("CREATE VIRTUAL TABLE test USING fts5(text)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
+def _sqlite_value(value):
+    # is_pr and the author names are copied from the JSON as they are; the CSV writer would write str() of
+    # anything that is not a plain value
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
 
-    for idx, pr_id in enumerate(data.keys(), start=1):
+
+class SQLiteRowWriter:
+    """Write extracted PRs to normalized SQLite tables in large transactions, building the indexes at the end."""
+
+    def __init__(self, database_file, batch_size=SQLITE_BATCH_SIZE, full_text=False):
+        if full_text and not fts5_available():
+            # Checked before converting anything rather than after the last row
+            raise RuntimeError("The SQLite library of this Python has no FTS5 support, so no full-text index "
+                               "can be built")
+        self.database_file = database_file
+        self.batch_size = batch_size
+        self.full_text = full_text
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(database_file + suffix):
+                os.remove(database_file + suffix)
+        # The rows may be written by a BackgroundWriter thread, one thread at a time
+        self.connection = sqlite3.connect(database_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        # A database left half written by an interrupted run is simply written again, so the transactions
+        # do not need to wait for the disk
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("PRAGMA cache_size = -65536")
+        for table, columns in SQLITE_TABLES.items():
+            self.connection.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        self.inserts = {table: f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})"
+                        for table, columns in SQLITE_TABLES.items()}
+        self.batches = {table: [] for table in SQLITE_TABLES}
+
+    def write(self, idx, pr_id, record, tables=None):
+        """Add one PR; tables may pass on its rows from explode_record when they were already built."""
+        batches = self.batches
+        batches["prs"].append((idx, pr_id, _sqlite_value(record.is_pr), record.title, record.body, record.created_at,
+                               record.closed_at, record.userlogin, _sqlite_value(record.author_name),
+                               record.newest_commit_hash))
+        if tables is None:
+            tables = explode_record(idx, pr_id, record)
+        for table, rows in tables.items():
+            if table == "commits":
+                rows = [row if isinstance(row[4], str) else row[:4] + (_sqlite_value(row[4]), row[5]) for row in rows]
+            batches[table].extend(rows)
+        if len(batches["prs"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batches["prs"]:
+            # One transaction for the whole batch
+            with self.connection:
+                for table, rows in self.batches.items():
+                    self.connection.executemany(self.inserts[table], rows)
+            self.batches = {table: [] for table in SQLITE_TABLES}
+
+    def append_database(self, database_file, row_offset):
+        """Copy the rows of another database written by SQLiteRowWriter, adding row_offset to its row numbers."""
+        self.flush()
+        self.connection.execute("ATTACH DATABASE ? AS part", (database_file,))
         try:
-            pr = data[pr_id]
-            row_data = extract_data(pr)
-
-            # Format the data into the desired structure
-            formatted_data = [
-                idx,
-                pr_id,
-                row_data.get("Pull Request", ""),
-                row_data.get("issue text", ""),
-                row_data.get("issue description", ""),
-                row_data.get("pull request text", ""),
-                row_data.get("pull request description", ""),
-                row_data.get("created_at", ""),
-                row_data.get("closed_at", ""),
-                row_data.get("userlogin", ""),
-                row_data.get("author_name", ""),
-                row_data.get("comments", "").split(" | "),
-                row_data.get("files_changed", "").split(" | "),
-                row_data.get("commit_hashes", "").split(" | "),
-                row_data.get("newest_commit_hash", "")
-            ]
-
-            # Append the formatted data to the list
-            pickle_data.append(formatted_data)
+            with self.connection:
+                for table, columns in SQLITE_TABLES.items():
+                    names = ["row_number + ?"] + [column.split()[0] for column in columns[1:]]
+                    self.connection.execute(f"INSERT INTO {table} SELECT {', '.join(names)} FROM part.{table}",
+                                            (row_offset,))
+        finally:
+            self.connection.execute("DETACH DATABASE part")
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.flush()
+                for table, column in SQLITE_INDEXES:
+                    self.connection.execute(f"CREATE INDEX {table}_{column} ON {table} ({column})")
+                if self.full_text:
+                    with self.connection:
+                        for statement in SQLITE_FULL_TEXT:
+                            self.connection.execute(statement)
+                self.connection.execute("ANALYZE")
+                # Back to a rollback journal, so the finished database is a single file that can be opened read-only
+                self.connection.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                self.connection.close()
+                self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of class SQLiteRowWriter
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to search the full-text index of a database written by SQLiteRowWriter with full_text=True
+# Input - database_file: the name of the SQLite database
+#         query: an FTS5 query, e.g. words that must all appear, "an exact phrase", or terms joined by OR
+#         limit: the largest number of results
+# Output - a list of SearchResult(row_number, pr_id, snippet) tuples, best matches first, where snippet shows
+#          the matching words of the title, description or comments in [brackets]
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+SearchResult = namedtuple("SearchResult", ["row_number", "pr_id", "snippet"])
+
+
+def search(database_file, query, limit=20):
+    """Return the PRs matching query in the pr_search index of database_file."""
+    if not os.path.exists(database_file):
+        raise FileNotFoundError(f"No such database: {database_file}")
+    connection = sqlite3.connect(database_file)
+    try:
+        if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'pr_search'").fetchone() is None:
+            raise ValueError(f"{database_file} has no full-text index, convert the dump with --fts to build one")
+        return [SearchResult._make(row) for row in connection.execute(
+            "SELECT prs.row_number, prs.pr_id, snippet(pr_search, -1, '[', ']', '...', 12) "
+            "FROM pr_search JOIN prs ON prs.row_number = pr_search.rowid "
+            "WHERE pr_search MATCH ? ORDER BY rank LIMIT ?", (query, limit))]
+    finally:
+        connection.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of function search
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Class and functions to record the time and number of calls spent in each stage of a conversion
+# Input - enable_metrics() replaces the stage functions of this module (JSON reading, find_linked_issues,
+#         parse_commit_date, extract_data) with timed wrappers; disable_metrics() puts the originals back
+# Output - the Metrics object in METRICS, with wall time and calls per stage, linked-issue matches per keyword
+#          and bytes written per output, printed by report() or saved by save()
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+# None while instrumentation is off, in which case nothing is wrapped and the hot loop pays nothing
+METRICS = None
+_INSTRUMENTED_FUNCTIONS = ["iter_json_object", "find_linked_issues", "parse_commit_date", "extract_data"]
+_UNINSTRUMENTED = {}
+
+
+class Metrics:
+    """Wall time and call counts per stage, plus match and byte counters."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = Counter()
+        self.calls = Counter()
+        self.keyword_matches = Counter()
+        self.bytes_written = Counter()
+        # Extraction threads update the stage counters at the same time on free-threaded builds
+        self.lock = threading.Lock()
 
+    def reset(self):
+        # Cleared in place, since the wrappers hold on to these counters
+        self.seconds.clear()
+        self.calls.clear()
+        self.keyword_matches.clear()
+        self.bytes_written.clear()
+
+    def timed(self, stage, function):
+        """Wrap function so every call adds to the time and call count of stage."""
+        seconds = self.seconds
+        calls = self.calls
+        lock = self.lock
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                with lock:
+                    seconds[stage] += elapsed
+                    calls[stage] += 1
+        return wrapper
+
+    def timed_iter(self, stage, function):
+        """Wrap a generator function so the time spent producing each item adds to stage."""
+        def wrapper(*args, **kwargs):
+            iterator = function(*args, **kwargs)
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.seconds[stage] += time.perf_counter() - start
+                    self.calls[stage] += 1
+                    yield item
+            finally:
+                iterator.close()
+        return wrapper
+
+    def count_keywords(self, function):
+        """Wrap find_linked_issues so the keywords it matched are counted."""
+        timed_function = self.timed("find_linked_issues", function)
+
+        def wrapper(body_text):
+            linked_issues, description_keywords = timed_function(body_text)
+            with self.lock:
+                self.keyword_matches.update(description_keywords)
+            return linked_issues, description_keywords
+        return wrapper
+
+    def add_output(self, sink, filename):
+        if os.path.exists(filename):
+            self.bytes_written[sink] += os.path.getsize(filename)
+
+    def snapshot(self):
+        return {
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+            "keyword_matches": dict(self.keyword_matches),
+            "bytes_written": dict(self.bytes_written),
+        }
+
+    def merge(self, snapshot):
+        """Add the counters recorded by another process."""
+        self.seconds.update(snapshot["seconds"])
+        self.calls.update(snapshot["calls"])
+        self.keyword_matches.update(snapshot["keyword_matches"])
+        self.bytes_written.update(snapshot["bytes_written"])
+
+    def to_dict(self):
+        result = self.snapshot()
+        result["total_seconds"] = time.perf_counter() - self.started
+        return result
+
+    def report(self):
+        """Return a readable summary of the recorded metrics."""
+        lines = [f"{'stage':<22}{'calls':>12}{'seconds':>12}{'us/call':>12}"]
+        for stage, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            calls = self.calls[stage]
+            per_call = seconds / calls * 1e6 if calls else 0.0
+            lines.append(f"{stage:<22}{calls:>12}{seconds:>12.3f}{per_call:>12.2f}")
+        lines.append(f"{'total wall time':<22}{'':>12}{time.perf_counter() - self.started:>12.3f}")
+        if self.keyword_matches:
+            lines.append("linked-issue matches per keyword: " + ", ".join(
+                f"{keyword}={count}" for keyword, count in self.keyword_matches.most_common()))
+        for sink, size in self.bytes_written.items():
+            lines.append(f"bytes written to {sink}: {size}")
+        return "\n".join(lines)
+
+    def save(self, metrics_file):
+        with open(metrics_file, 'w', encoding='utf-8') as mf:
+            json.dump(self.to_dict(), mf, indent=2)
+
+
+def enable_metrics():
+    """Start recording metrics in METRICS, wrapping the stage functions of this module."""
+    global METRICS
+    if METRICS is None:
+        METRICS = Metrics()
+        module_globals = globals()
+        for name in _INSTRUMENTED_FUNCTIONS:
+            _UNINSTRUMENTED[name] = module_globals[name]
+        module_globals["iter_json_object"] = METRICS.timed_iter("JSON parsing", _UNINSTRUMENTED["iter_json_object"])
+        module_globals["find_linked_issues"] = METRICS.count_keywords(_UNINSTRUMENTED["find_linked_issues"])
+        module_globals["parse_commit_date"] = METRICS.timed("parse_commit_date", _UNINSTRUMENTED["parse_commit_date"])
+        module_globals["extract_data"] = METRICS.timed("extract_data", _UNINSTRUMENTED["extract_data"])
+    return METRICS
+
+
+def disable_metrics():
+    """Stop recording metrics and restore the uninstrumented functions."""
+    global METRICS
+    globals().update(_UNINSTRUMENTED)
+    _UNINSTRUMENTED.clear()
+    METRICS = None
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for metrics
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to run extract_data over many PRs, either in this process or in a pool of worker processes or threads
+# Input - entries: an iterable of (pr_id, pr) pairs, such as the output of iter_json_object
+#         jobs: the number of workers, 1 to extract in this process
+#         fields: an optional set of the PRRecord fields to extract, see extract_data
+# Output - a generator of (idx, pr_id, record, error) tuples in the original order of the entries,
+#          where record is None and error holds the message when extract_data failed, and both are None
+#          for the entries a PRFilter rejected (their pr is FILTERED_OUT)
+# Date: 10/17/2026
+# Modified to optionally return the results of the workers through shared memory instead of the pool's pipes
+# Date: 10/17/2026
+# Modified to use a pool of threads on free-threaded Python builds, where they run extract_data in parallel
+# Date: 10/17/2026
+# Modified to start the worker processes from a fork server, since this process may already run threads
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+CHUNK_TARGET_SIZE = 1 << 18
+CHUNK_MAX_ENTRIES = 512
+
+
+def estimate_pr_size(pr):
+    """Roughly estimate the amount of text extract_data will process for a PR."""
+    size = 256
+    try:
+        size += len(pr.get("body") or "") + len(pr.get("title") or "")
+        comments = pr.get("comments")
+        if comments:
+            for comment in comments.values():
+                size += len(comment.get("body") or "") + 64
+        commits = pr.get("commits")
+        if commits:
+            size += 128 * len(commits)
+    except (AttributeError, TypeError):
+        pass  # Malformed entries are reported by extract_data in the worker
+    return size
+
+
+def iter_chunks(entries, target_size=CHUNK_TARGET_SIZE, max_entries=CHUNK_MAX_ENTRIES):
+    """Group numbered entries into chunks of about target_size, so one huge PR gets a chunk of its own."""
+    chunk = []
+    chunk_size = 0
+    for idx, (pr_id, pr) in enumerate(entries, start=1):
+        chunk.append((idx, pr_id, pr))
+        chunk_size += estimate_pr_size(pr)
+        if chunk_size >= target_size or len(chunk) >= max_entries:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        yield chunk
+
+
+def extract_chunk(chunk, collect_metrics=False, fields=None):
+    """Run extract_data over one chunk of (idx, pr_id, pr) tuples."""
+    if collect_metrics:
+        # Record this chunk's metrics in the worker and send them back with the results
+        enable_metrics().reset()
+    results = []
+    for idx, pr_id, pr in chunk:
+        if pr is FILTERED_OUT:
+            results.append((idx, pr_id, None, None))
+            continue
+        try:
+            results.append((idx, pr_id, extract_data(pr, fields), None))
         except Exception as e:
-            print(f"Error processing entry {pr_id} for pickle: {e}")
+            results.append((idx, pr_id, None, str(e)))
+    if collect_metrics:
+        return results, METRICS.snapshot()
+    return results
 
-    # ----------------------------------------------------------------------------------------------------------------------
-    # Modified to have pickle  file name match json file name
-    # Date: 6/10/2024
-    # Modified by Adonijah Farner
-    # ----------------------------------------------------------------------------------------------------------------------
-    # Save the list to a pickle file
-    with open(pickle_file, 'wb') as pf:
-        pickle.dump(pickle_data, pf)
 
-    print(f"Data successfully saved to {pickle_file}")
+# Keywords in records built by another process are equal to LINKED_ISSUE_KEYWORDS but are not the same objects,
+# and pickle only shares repeated objects, so they are swapped back to keep the pickle file byte for byte the same
+_KEYWORD_OBJECTS = {keyword: keyword for keyword in LINKED_ISSUE_KEYWORDS}
+
+
+def share_keywords(record):
+    """Make the description keywords of a record the LINKED_ISSUE_KEYWORDS strings, as extract_data does."""
+    keywords = record.description_keywords
+    for position, keyword in enumerate(keywords):
+        keywords[position] = _KEYWORD_OBJECTS.get(keyword, keyword)
+    return record
+
+
+# Whether the workers return their results through shared memory, see use_shared_results
+SHARED_RESULTS = False
+# Results smaller than this are sent back through the pool's pipe, where they fit in a few writes
+SHARED_RESULT_MIN_SIZE = 1 << 16
+SharedResult = namedtuple("SharedResult", ["name", "size"])
+
+
+def use_shared_results(enabled=True):
+    """Choose whether worker processes hand their extracted rows back through shared memory segments."""
+    global SHARED_RESULTS
+    SHARED_RESULTS = enabled
+
+
+def run_shared(function, *args):
+    """Run function in a worker and hand its pickled result back through shared memory when it is large."""
+    data = pickle.dumps(function(*args), protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) < SHARED_RESULT_MIN_SIZE:
+        return data
+    try:
+        segment = shared_memory.SharedMemory(create=True, size=len(data))
+    except OSError:
+        return data  # e.g. /dev/shm is full; the pipe still works
+    try:
+        segment.buf[:len(data)] = data
+    finally:
+        segment.close()
+    # The parent unlinks the segment once it has read it
+    return SharedResult(segment.name, len(data))
+
+
+def load_shared(result):
+    """Unpickle a result of run_shared, reading a shared memory segment in place and then removing it."""
+    if not isinstance(result, SharedResult):
+        return pickle.loads(result)
+    segment = shared_memory.SharedMemory(name=result.name)
+    try:
+        view = segment.buf[:result.size]
+        try:
+            return pickle.loads(view)
+        finally:
+            view.release()
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+# The kind of pool extraction_pool returns, see use_executor
+EXECUTOR_KINDS = ("auto", "threads", "processes")
+EXTRACTION_EXECUTOR = "auto"
+
+
+def use_executor(kind="auto"):
+    """Choose the pool that runs extract_data for jobs > 1: "threads", "processes" or "auto"."""
+    global EXTRACTION_EXECUTOR
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown executor {kind!r}; the executors are {', '.join(EXECUTOR_KINDS)}")
+    EXTRACTION_EXECUTOR = kind
+
+
+def free_threaded():
+    """Return True on a free-threaded build of Python running without the GIL, where threads run in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def submit_extraction(executor, function, *args):
+    """Submit function(*args) to an extraction pool, through run_shared when shared results are enabled."""
+    if SHARED_RESULTS and isinstance(executor, ProcessPoolExecutor):
+        return executor.submit(run_shared, function, *args)
+    return executor.submit(function, *args)
+
+
+def extraction_pool(jobs):
+    """Return a pool for extraction tasks: threads on a free-threaded build (or when chosen), processes otherwise."""
+    if EXTRACTION_EXECUTOR == "threads" or (EXTRACTION_EXECUTOR == "auto" and free_threaded()):
+        # extract_data only reads module state (compiled patterns and keyword tables), so threads can share it
+        return ThreadPoolExecutor(max_workers=jobs)
+    # Start the resource tracker before the workers, so they share it with this process. Otherwise each worker
+    # starts its own, which does not see this process unlink the segments and warns about them at exit.
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=worker_context())
+
+
+def worker_context():
+    """Return the multiprocessing context for extraction workers, which must not be forked from this process."""
+    # By the time the pool starts, this process runs threads of its own (compressors, writers, read-ahead), and a
+    # child forked from a process with threads can deadlock. A fork server forks the workers from a process that
+    # has none; a start method chosen explicitly other than fork (e.g. spawn) is kept.
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method in (None, "fork") and "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def collects_metrics(executor):
+    """Return True when the tasks of executor have to record metrics themselves and send them back."""
+    # Threads already record into METRICS, which they share with this thread
+    return METRICS is not None and isinstance(executor, ProcessPoolExecutor)
+
+
+def _release_pending(pending):
+    # Free the shared memory of results nobody will read, when the rows stop being consumed early
+    for future in pending:
+        if not future.cancel():
+            try:
+                result = future.result()
+                if isinstance(result, SharedResult):
+                    load_shared(result)
+            except Exception:
+                pass
+
+
+def _chunk_results(future):
+    results = future.result()
+    if isinstance(results, (bytes, SharedResult)):
+        results = load_shared(results)
+    if isinstance(results, tuple):
+        results, snapshot = results
+        METRICS.merge(snapshot)
+    for _, _, record, _ in results:
+        if record is not None and record.description_keywords:
+            share_keywords(record)
+    return results
+
+
+def iter_extracted(entries, jobs=1, fields=None):
+    """Yield (idx, pr_id, record, error) for each entry, keeping the input order."""
+    if jobs <= 1:
+        for idx, (pr_id, pr) in enumerate(entries, start=1):
+            if pr is FILTERED_OUT:
+                yield idx, pr_id, None, None
+                continue
+            try:
+                yield idx, pr_id, extract_data(pr, fields), None
+            except Exception as e:
+                yield idx, pr_id, None, str(e)
+        return
+
+    # Keep only a few chunks in flight per worker so the reader does not run ahead of the pool
+    with extraction_pool(jobs) as executor:
+        pending = deque()
+        try:
+            for chunk in iter_chunks(entries):
+                pending.append(submit_extraction(executor, extract_chunk, chunk, collects_metrics(executor), fields))
+                if len(pending) >= 2 * jobs:
+                    yield from _chunk_results(pending.popleft())
+            while pending:
+                yield from _chunk_results(pending.popleft())
+        finally:
+            _release_pending(pending)
 #----------------------------------------------------------------------------------------------------------------------
-# End of function convert_to_pickle
+# End of functions for running extract_data
 #----------------------------------------------------------------------------------------------------------------------
 
 #----------------------------------------------------------------------------------------------------------------------
-# Main script to read JSON data, process it, and write to a CSV file
-# Input - JSON file (jabref_output.json) containing pull request data
-# Output - CSV file (jabref_output.csv) with processed pull request data
+# Functions to keep the extracted rows of each input file in an on-disk cache
+# Input - json_filename: the path of the JSON file
+#         cache_dir: the directory holding the cache files
+#         jobs: the number of worker processes used when the cache has to be built
+#         fields: an optional set of the PRRecord fields to extract; each set has a cache file of its own
+#         pr_filter: an optional PRFilter; each filter also has a cache file of its own
+# Output - a generator of (idx, pr_id, record, error) tuples like iter_extracted. When a cache file exists for
+#          the content of json_filename, the rows are read from it without decoding any JSON; otherwise they
+#          are extracted and saved while they are yielded.
+# Date: 10/17/2026
+# Modified to remove the cache files of a path's previous content once it changes, so the cache does not grow
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+# Increase when extract_data or PRRecord change, so caches written by older versions are not reused
+CACHE_VERSION = 2
+
+
+def hash_file(filename):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_cache_meta(meta_file, stat, content_hash, meta=None):
+    with open(meta_file, 'w', encoding='utf-8') as mf:
+        json.dump({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}, mf)
+    # The path now has new content: remove the cache files (of every projection) of its previous content
+    old_hash = meta.get("sha256") if meta else None
+    if old_hash and old_hash != content_hash:
+        for old_file in glob.glob(os.path.join(os.path.dirname(meta_file), f"{old_hash}.v*.pkl")):
+            try:
+                os.remove(old_file)
+            except OSError:
+                pass
+
+
+def projection_key(fields, pr_filter=None):
+    """Return a short name for a set of extracted fields and a filter, "" when every field and PR is extracted."""
+    if fields is None and pr_filter is None:
+        return ""
+    description = repr((sorted(fields) if fields is not None else None,
+                        pr_filter._replace(users=sorted(pr_filter.users or [])) if pr_filter is not None else None))
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:12]
+
+
+def iter_cached_extracted(json_filename, cache_dir, jobs=1, fields=None, pr_filter=None, index_file=None):
+    """Yield (idx, pr_id, record, error) for each entry of json_filename, reusing a cache of a previous run."""
+    os.makedirs(cache_dir, exist_ok=True)
+    stat = os.stat(json_filename)
+
+    # The meta file remembers the content hash of this path, so an unchanged file (same size and mtime)
+    # is not even hashed again. A changed mtime falls back to hashing, which still finds the cache when
+    # only the timestamp changed.
+    path_key = hashlib.sha1(os.path.abspath(json_filename).encode('utf-8')).hexdigest()
+    meta_file = os.path.join(cache_dir, f"{path_key}.meta.json")
+    try:
+        with open(meta_file, 'r', encoding='utf-8') as mf:
+            meta = json.load(mf)
+    except (OSError, ValueError):
+        meta = None
+    if meta and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+        content_hash = meta["sha256"]
+    else:
+        content_hash = hash_file(json_filename)
+    projection = projection_key(fields, pr_filter)
+    if projection:
+        cache_file = os.path.join(cache_dir, f"{content_hash}.v{CACHE_VERSION}.{projection}.pkl")
+    else:
+        cache_file = os.path.join(cache_dir, f"{content_hash}.v{CACHE_VERSION}.pkl")
+
+    if os.path.exists(cache_file):
+        if not meta or meta.get("mtime_ns") != stat.st_mtime_ns:
+            _write_cache_meta(meta_file, stat, content_hash, meta)
+        print(f"Using cached extraction {cache_file}")
+        # Records are cached as plain tuples so the cache does not depend on the module name PRRecord had
+        for idx, pr_id, cached_fields, error in iter_pickle_rows(cache_file):
+            record = share_keywords(PRRecord._make(cached_fields)) if cached_fields is not None else None
+            yield idx, pr_id, record, error
+        return
+
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with PickleRowWriter(temp_file) as cache_writer:
+            for idx, pr_id, record, error in iter_file_extracted(json_filename, jobs, fields, pr_filter, index_file):
+                cache_writer.write((idx, pr_id, tuple(record) if record is not None else None, error))
+                yield idx, pr_id, record, error
+        # Only keep the cache if the file did not change while it was being read
+        end_stat = os.stat(json_filename)
+        if (end_stat.st_size, end_stat.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            os.replace(temp_file, cache_file)
+            _write_cache_meta(meta_file, stat, content_hash, meta)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for the extraction cache
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to extract only the PRs that were added or changed since the previous run
+# Input - json_filename: the path of the JSON file
+#         manifest_file: the SQLite file remembering the JSON text digest and extracted record of every PR
+#         jobs: the number of worker processes for the PRs that have to be extracted
+#         fields: an optional set of the PRRecord fields to extract; the manifest starts over when it changes
+#         pr_filter: an optional PRFilter; the manifest also starts over when it changes
+# Output - a generator of (idx, pr_id, record, error) tuples like iter_extracted. PRs whose JSON text is the same
+#          as in the previous run are neither decoded nor extracted; their records come from the manifest,
+#          which is updated in place and committed once the whole file has been read.
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+MANIFEST_BATCH_SIZE = 1000
+
+
+def _open_manifest(manifest_file, fields=None, pr_filter=None):
+    connection = sqlite3.connect(manifest_file)
+    connection.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value)")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS entries (pr_id TEXT PRIMARY KEY, length INTEGER, digest BLOB, fields BLOB, error TEXT)"
+    )
+    version = connection.execute("SELECT value FROM info WHERE key = 'version'").fetchone()
+    projection = connection.execute("SELECT value FROM info WHERE key = 'projection'").fetchone()
+    key = projection_key(fields, pr_filter)
+    if version is None or version[0] != CACHE_VERSION or (projection[0] if projection else "") != key:
+        # Records extracted by another version of extract_data, or with other fields or filters, cannot be reused
+        connection.execute("DELETE FROM entries")
+        connection.execute("INSERT OR REPLACE INTO info VALUES ('version', ?)", (CACHE_VERSION,))
+        connection.execute("INSERT OR REPLACE INTO info VALUES ('projection', ?)", (key,))
+    return connection
+
+
+def iter_incremental_extracted(json_filename, manifest_file, jobs=1, fields=None, pr_filter=None):
+    """Yield (idx, pr_id, record, error) for each entry, extracting only the PRs that changed since the last run."""
+    connection = _open_manifest(manifest_file, fields, pr_filter)
+    try:
+        digests = {pr_id: (length, digest)
+                   for pr_id, length, digest in connection.execute("SELECT pr_id, length, digest FROM entries")}
+        seen = set()
+        # Entries in file order; changed ones carry their new (length, digest), unchanged ones None
+        pending = deque()
+        updates = []
+
+        skip_keys = skipped_keys(fields)
+
+        def changed_entries():
+            for pr_id, pr, length, digest in iter_json_object(json_file, digests=digests, skip_keys=skip_keys,
+                                                              pr_filter=pr_filter):
+                seen.add(pr_id)
+                if digests.get(pr_id) == (length, digest):
+                    pending.append((pr_id, None))
+                else:
+                    pending.append((pr_id, (length, digest)))
+                    yield pr_id, pr
+
+        def load_unchanged(pr_id):
+            record_blob, error = connection.execute(
+                "SELECT fields, error FROM entries WHERE pr_id = ?", (pr_id,)).fetchone()
+            if record_blob is None:
+                return None, error
+            return share_keywords(PRRecord._make(pickle.loads(record_blob))), error
+
+        idx = 0
+        reused = 0
+        with open_input(json_filename) as json_file:
+            # iter_extracted only sees the changed entries; the unchanged ones read before each of them are
+            # already queued in pending, so the rows can be yielded in file order
+            for _, _, record, error in iter_extracted(changed_entries(), jobs, fields):
+                while pending[0][1] is None:
+                    idx += 1
+                    reused += 1
+                    pr_id = pending.popleft()[0]
+                    yield (idx, pr_id) + load_unchanged(pr_id)
+                pr_id, (length, digest) = pending.popleft()
+                idx += 1
+                record_blob = pickle.dumps(tuple(record)) if record is not None else None
+                updates.append((pr_id, length, digest, record_blob, error))
+                if len(updates) >= MANIFEST_BATCH_SIZE:
+                    connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", updates)
+                    updates = []
+                yield idx, pr_id, record, error
+            while pending:
+                idx += 1
+                reused += 1
+                pr_id = pending.popleft()[0]
+                yield (idx, pr_id) + load_unchanged(pr_id)
+
+        connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", updates)
+        removed = [(pr_id,) for pr_id in digests if pr_id not in seen]
+        connection.executemany("DELETE FROM entries WHERE pr_id = ?", removed)
+        connection.commit()
+        print(f"Reused {reused} unchanged entries, extracted {idx - reused} new or changed entries, "
+              f"dropped {len(removed)} removed entries.")
+    finally:
+        # Closing without a commit rolls back, so an interrupted run leaves the previous manifest intact
+        connection.close()
+#----------------------------------------------------------------------------------------------------------------------
+# End of function iter_incremental_extracted
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Library functions to read extracted PR rows without going through the command line
+# Input - source: the path of a JSON file, an open JSON text file, or an already loaded {pr_id: pr} dictionary
+#         jobs: the number of worker processes, 1 to extract in this process
+#         cache_dir: an optional directory for the extraction cache, used when source is a path
+#         manifest_file: an optional manifest for incremental extraction, used when source is a path
+#         on_error: an optional function called with (pr_id, message) for each entry extract_data fails on
+#         fields: an optional set of the PRRecord fields to extract (see column_fields); iter_rows takes the
+#                 HEADER columns instead, and leaves the fields no column needs empty
+#         pr_filter: an optional PRFilter from make_pr_filter; the PRs it rejects are not extracted or yielded,
+#                    but keep their place in the row numbering
+#         index_file: an optional byte-offset index file for source, see build_index; with several jobs the
+#                     workers then read their PRs from the file themselves
+# Output - iter_entries yields (pr_id, pr) pairs; iter_source_extracted yields (idx, pr_id, record, error)
+#          tuples; iter_rows lazily yields an ExtractedRow for each PR
+# Date: 10/17/2026
+# Modified to only read by byte range when given an index file, so no index is written next to the input
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+ExtractedRow = namedtuple("ExtractedRow", ["row_number", "pr_id", "record"])
+
+
+def iter_entries(source, fields=None, pr_filter=None):
+    """Yield (pr_id, pr) pairs from a JSON file path, an open JSON file or a dictionary."""
+    if isinstance(source, dict):
+        if pr_filter is None:
+            yield from source.items()
+        else:
+            for pr_id, pr in source.items():
+                yield pr_id, pr if accepts_pr(pr_filter, pr) else FILTERED_OUT
+    elif hasattr(source, "read"):
+        entries = iter_json_object(source, skip_keys=skipped_keys(fields), pr_filter=pr_filter)
+        yield from iter_prefetched(entries) if PIPELINE else entries
+    else:
+        with open_input(source) as f:
+            entries = iter_json_object(f, skip_keys=skipped_keys(fields), pr_filter=pr_filter)
+            yield from iter_prefetched(entries) if PIPELINE else entries
+
+
+def iter_source_extracted(source, jobs=1, cache_dir=None, manifest_file=None, fields=None, pr_filter=None,
+                          index_file=None):
+    """Yield (idx, pr_id, record, error) for each entry of source, through the cache or manifest when given."""
+    if isinstance(source, dict) or hasattr(source, "read"):
+        return iter_extracted(iter_entries(source, fields, pr_filter), jobs, fields)
+    if manifest_file is not None:
+        return iter_incremental_extracted(source, manifest_file, jobs, fields, pr_filter)
+    if cache_dir is not None:
+        return iter_cached_extracted(source, cache_dir, jobs, fields, pr_filter, index_file)
+    return iter_file_extracted(source, jobs, fields, pr_filter, index_file)
+
+
+def iter_rows(source, jobs=1, on_error=None, cache_dir=None, manifest_file=None, columns=None, pr_filter=None,
+              index_file=None):
+    """Yield an ExtractedRow(row_number, pr_id, record) for each PR in source, in file order."""
+    fields = column_fields(columns)
+    for idx, pr_id, record, error in iter_source_extracted(source, jobs, cache_dir, manifest_file, fields, pr_filter,
+                                                           index_file):
+        if record is not None:
+            yield ExtractedRow(idx, pr_id, record)
+        elif error is not None and on_error is not None:
+            on_error(pr_id, error)
+#----------------------------------------------------------------------------------------------------------------------
+# End of library functions
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to index where each entry of a JSON file is, and to read single PRs through the index
+# Input - json_filename: the path of an uncompressed JSON file
+#         index_file: the SQLite file holding the index, by default index_filename(json_filename) next to the
+#                     JSON file
+#         pr_id: the id of the PR to read
+#         columns: an optional list of HEADER columns, as for iter_rows
+# Output - build_index records the byte range of every top-level entry in index_file and returns the number of
+#          entries; open_index returns a connection to an index that matches the size and modification time of
+#          json_filename, building it first when needed; read_pr returns (row_number, pr) with the raw PR
+#          dictionary and extract_pr an ExtractedRow, both decoding only the bytes of that PR from a memory map
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+# Increase when the layout of the index changes, so older index files are rebuilt
+INDEX_VERSION = 1
+INDEX_BATCH_SIZE = 10000
+
+
+def index_filename(json_filename):
+    """Return the default sidecar index file of a JSON file, e.g. test.index.sqlite for test.json."""
+    return f"{os.path.splitext(json_filename)[0]}.index.sqlite"
+
+
+def _read_key(raw_file, start, end):
+    # Decode the key between the end of the previous value and the start of this one, e.g. b', "id": '
+    raw_file.seek(start)
+    text = raw_file.read(end - start).decode('utf-8').strip()
+    return json.loads(text[1:-1].strip())
+
+
+def build_index(json_filename, index_file=None):
+    """Write the byte range of every top-level entry of json_filename to a sidecar index."""
+    if compression_suffix(json_filename):
+        raise ValueError(f"Cannot index {json_filename}: only uncompressed JSON files can be read by byte offset")
+    index_file = index_file or index_filename(json_filename)
+    stat = os.stat(json_filename)
+    temp_file = f"{index_file}.{os.getpid()}.tmp"
+    count = 0
+    try:
+        connection = sqlite3.connect(temp_file)
+        try:
+            connection.execute("CREATE TABLE info (key TEXT PRIMARY KEY, value)")
+            connection.execute(
+                "CREATE TABLE entries (row_number INTEGER PRIMARY KEY, pr_id TEXT, byte_start INTEGER, byte_end INTEGER)"
+            )
+            # Latin-1 turns every byte into one character, so the positions iter_json_object reports are byte
+            # offsets. A key is only decoded again as UTF-8 when it has characters outside ASCII.
+            with open(json_filename, 'r', encoding='latin-1', newline='') as f, open(json_filename, 'rb') as raw:
+                rows = []
+                previous_end = 0
+                for pr_id, start, end in iter_json_object(f, spans=True):
+                    if not pr_id.isascii():
+                        pr_id = _read_key(raw, previous_end, start)
+                    count += 1
+                    rows.append((count, pr_id, start, end))
+                    previous_end = end
+                    if len(rows) >= INDEX_BATCH_SIZE:
+                        connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+                        rows = []
+                connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+            connection.execute("CREATE INDEX entries_pr_id ON entries (pr_id)")
+            connection.executemany("INSERT INTO info VALUES (?, ?)", [
+                ("version", INDEX_VERSION), ("size", stat.st_size), ("mtime_ns", stat.st_mtime_ns)])
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temp_file, index_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    # On stderr, so it does not mix with the rows of --pr or the output of a program using iter_rows
+    print(f"Indexed {count} entries of {json_filename} into {index_file}", file=sys.stderr)
+    return count
+
+
+def _fresh_index(json_filename, index_file):
+    # Return a connection to index_file when it indexes the current content of json_filename, None otherwise
+    stat = os.stat(json_filename)
+    if not os.path.exists(index_file):
+        return None
+    connection = sqlite3.connect(index_file)
+    try:
+        info = dict(connection.execute("SELECT key, value FROM info"))
+    except sqlite3.DatabaseError:
+        info = {}
+    if info == {"version": INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}:
+        return connection
+    connection.close()
+    return None
+
+
+def open_index(json_filename, index_file=None):
+    """Return a connection to the index of json_filename, building or rebuilding it when it is missing or stale."""
+    index_file = index_file or index_filename(json_filename)
+    connection = _fresh_index(json_filename, index_file)
+    if connection is None:
+        build_index(json_filename, index_file)
+        connection = sqlite3.connect(index_file)
+    return connection
+
+
+def read_pr(json_filename, pr_id, index_file=None):
+    """Return (row_number, pr) for one entry of json_filename, decoding only its own bytes."""
+    connection = open_index(json_filename, index_file)
+    try:
+        # A repeated id is converted to one row per occurrence; the last one is read here, the value json.load kept
+        found = connection.execute(
+            "SELECT row_number, byte_start, byte_end FROM entries WHERE pr_id = ? ORDER BY row_number DESC LIMIT 1",
+            (pr_id,)).fetchone()
+    finally:
+        connection.close()
+    if found is None:
+        raise KeyError(pr_id)
+    row_number, start, end = found
+    with open(json_filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return row_number, json.loads(mapped[start:end].decode('utf-8'))
+
+
+def extract_pr(json_filename, pr_id, index_file=None, columns=None):
+    """Return the ExtractedRow of one PR of json_filename, reading it through the index."""
+    row_number, pr = read_pr(json_filename, pr_id, index_file)
+    return ExtractedRow(row_number, pr_id, extract_data(pr, column_fields(columns)))
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for the byte-offset index
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to extract a JSON file in worker processes that each decode their own byte ranges of it
+# Input - json_filename: the path of an uncompressed JSON file
+#         ranges: a list of (idx, pr_id, byte_start, byte_end) tuples from the index of json_filename
+#         index_file: the byte-offset index of json_filename, built in a worker when it is missing or stale
+#         jobs: the number of worker processes
+#         fields: an optional set of the PRRecord fields to extract, see extract_data
+#         pr_filter: an optional PRFilter, applied in the workers
+# Output - extract_ranges returns the results of extract_chunk for the given ranges; iter_range_extracted and
+#          iter_file_extracted yield (idx, pr_id, record, error) tuples like iter_extracted
+# Date: 10/17/2026
+# Modified to time the decoding in the workers as the JSON parsing stage of --metrics
+# Date: 10/17/2026
+# Modified to build a missing index in a worker, so this process never decodes the dump
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def extract_ranges(json_filename, ranges, collect_metrics=False, fields=None, pr_filter=None):
+    """Decode the entries at the given byte ranges of json_filename and run extract_data over them."""
+    if collect_metrics:
+        enable_metrics().reset()
+    # The entries are decoded here instead of by iter_json_object, so this is the "JSON parsing" stage
+    loads = METRICS.timed("JSON parsing", json.loads) if METRICS is not None else json.loads
+    skip_keys = skipped_keys(fields)
+    chunk = []
+    with open(json_filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for idx, pr_id, start, end in ranges:
+            pr = loads(mapped[start:end].decode('utf-8'))
+            chunk.append((idx, pr_id, prepare_entry(pr, skip_keys, pr_filter)))
+    results = extract_chunk(chunk, fields=fields)
+    if collect_metrics:
+        return results, METRICS.snapshot()
+    return results
+
+
+def iter_range_extracted(json_filename, index_file, jobs, fields=None, pr_filter=None):
+    """Yield (idx, pr_id, record, error) for each entry, sending the workers byte ranges instead of decoded PRs."""
+    pending = deque()
+    index = None
+    try:
+        with extraction_pool(jobs) as executor:
+            index = _fresh_index(json_filename, index_file)
+            if index is None:
+                # Built by a worker, so this process never decodes the dump; this first run decodes it twice
+                executor.submit(build_index, json_filename, index_file).result()
+                index = sqlite3.connect(index_file)
+
+            def submit(ranges):
+                return submit_extraction(executor, extract_ranges, json_filename, ranges,
+                                         collects_metrics(executor), fields, pr_filter)
+
+            ranges = []
+            ranges_size = 0
+            # The same chunk sizes as iter_chunks, measured in bytes of JSON text
+            entries = index.execute("SELECT row_number, pr_id, byte_start, byte_end FROM entries ORDER BY row_number")
+            for entry in entries:
+                ranges.append(entry)
+                ranges_size += entry[3] - entry[2]
+                if ranges_size >= CHUNK_TARGET_SIZE or len(ranges) >= CHUNK_MAX_ENTRIES:
+                    pending.append(submit(ranges))
+                    ranges = []
+                    ranges_size = 0
+                    if len(pending) >= 2 * jobs:
+                        yield from _chunk_results(pending.popleft())
+            if ranges:
+                pending.append(submit(ranges))
+            while pending:
+                yield from _chunk_results(pending.popleft())
+    finally:
+        _release_pending(pending)
+        if index is not None:
+            index.close()
+
+
+def iter_file_extracted(json_filename, jobs=1, fields=None, pr_filter=None, index_file=None):
+    """Yield (idx, pr_id, record, error) for each entry of a JSON file, by byte range when given an index file."""
+    if jobs > 1 and index_file is not None and not compression_suffix(json_filename):
+        return iter_range_extracted(json_filename, index_file, jobs, fields, pr_filter)
+    return iter_extracted(iter_entries(json_filename, fields, pr_filter), jobs, fields)
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for extracting by byte range
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to read JSON data, process it, and write it to a CSV file and a pickle file
+# Input - source: the path of a JSON file, an open JSON text file, or a {pr_id: pr} dictionary
+#         csv_filename: the name of the output CSV file
+#         pickle_filename: the name of the output pickle file
+#         jobs: the number of worker processes, 1 to extract in this process
+#         cache_dir: an optional directory for the extraction cache, used when source is a path
+#         manifest_file: an optional manifest for incremental extraction, used when source is a path
+#         sqlite_filename: an optional SQLite database to also write the PRs to, see SQLiteRowWriter
+#         full_text: True to build a full-text index in the SQLite database
+#         side_tables: True to also write the comments, commits and files side tables, see SideTableWriter
+#         columns: an optional list of HEADER columns for the CSV and pickle rows; only the fields they need
+#                  are extracted
+#         pr_filter: an optional PRFilter; the PRs it rejects are skipped before they are extracted, leaving a gap
+#                    in the row numbers
+#         index_file: an optional byte-offset index of source for the workers to read by, see iter_file_extracted
+# Output - the CSV and pickle files (and database and side tables); returns the number of entries processed
 # Written by Adonijah Farner
 # Modified to include created_at, closed_at, userlogin, author_name, comments, and files_changed
 # Date: 5/15/2024
+# Modified to move the conversion out of the main script so it can be called as a library function
+# Date: 10/17/2026
+# Modified to write each output on a thread of its own, see BackgroundWriter
+# Date: 10/17/2026
+# Modified to report ids that appear more than once in the input, which now get a row per occurrence
+# Date: 10/17/2026
 #----------------------------------------------------------------------------------------------------------------------
-# Read the JSON file
+def convert_file(source, csv_filename, pickle_filename, jobs=1, cache_dir=None, manifest_file=None,
+                 sqlite_filename=None, full_text=False, side_tables=False, columns=None, pr_filter=None,
+                 index_file=None):
+    """Convert the PRs in source to the CSV and pickle outputs."""
+    fields = column_fields(columns)
+    if sqlite_filename or side_tables:
+        if fields is not None:
+            raise ValueError("columns only apply to the CSV and pickle outputs, not to the SQLite database or side "
+                             "tables")
+        # The tables also need the commits of each PR
+        fields = ALL_FIELDS
+    if columns is not None:
+        projection = [HEADER.index(column) for column in columns]
+    if not isinstance(source, dict) and not hasattr(source, "read"):
+        # The entries are read lazily, so fail on a missing or unreadable input before the outputs are truncated
+        with open_input(source):
+            pass
 
-# ----------------------------------------------------------------------------------------------------------------------
-# Modified to read file from command line and have pickle and csv file name match json file name
-# Date: 6/10/2024
-# Modified by Adonijah Farner
-# ----------------------------------------------------------------------------------------------------------------------
+    # ----------------------------------------------------------------------------------------------------------------------
+    # Modified to stream the JSON file one entry at a time instead of loading it whole with json.load
+    # Date: 10/17/2026
+    # ----------------------------------------------------------------------------------------------------------------------
+    # Open the CSV file and the pickle file for writing
+    with ExitStack() as outputs:
+        f = outputs.enter_context(open_output(csv_filename))
+        pickle_writer = outputs.enter_context(PickleRowWriter(pickle_filename))
+        writer = csv.writer(f)
+
+        # Write the header
+        writer.writerow(HEADER if columns is None else columns)
+
+        write_csv_row = writer.writerow
+        write_pickle_row = pickle_writer.write
+        write_sqlite_row = None
+        write_side_tables = None
+        side_table_files = {}
+        if sqlite_filename:
+            write_sqlite_row = outputs.enter_context(SQLiteRowWriter(sqlite_filename, full_text=full_text)).write
+        if side_tables:
+            side_table_writer = outputs.enter_context(SideTableWriter(csv_filename))
+            write_side_tables = side_table_writer.write_tables
+            side_table_files = side_table_writer.filenames
+        if METRICS is not None:
+            write_csv_row = METRICS.timed("CSV writing", write_csv_row)
+            write_pickle_row = METRICS.timed("pickle writing", write_pickle_row)
+            if write_sqlite_row is not None:
+                write_sqlite_row = METRICS.timed("SQLite writing", write_sqlite_row)
+            if write_side_tables is not None:
+                write_side_tables = METRICS.timed("side table writing", write_side_tables)
+        if PIPELINE:
+            # One thread per output; entered last, so they are drained before the outputs are closed
+            write_csv_row = outputs.enter_context(BackgroundWriter(write_csv_row, "write CSV")).write
+            write_pickle_row = outputs.enter_context(BackgroundWriter(write_pickle_row, "write pickle")).write
+            if write_sqlite_row is not None:
+                write_sqlite_row = outputs.enter_context(BackgroundWriter(write_sqlite_row, "write SQLite")).write
+            if write_side_tables is not None:
+                write_side_tables = outputs.enter_context(
+                    BackgroundWriter(write_side_tables, "write side tables")).write
 
-# Check if the filename is provided
-if len(sys.argv) != 2:
-    print("Usage: python JSONToCSV.py <filename.json>")
-    sys.exit(1)
+        # ----------------------------------------------------------------------------------------------------------------------
+        # Modified to extract each PR once and hand the result to both the CSV writer and the pickle rows
+        # Date: 10/17/2026
+        # ----------------------------------------------------------------------------------------------------------------------
+        # Write the data rows to both files as they are extracted
+        idx = 0
+        filtered = 0
+        # The entries are streamed, so a repeated id cannot be merged into its first row the way json.load kept the
+        # last value at the first key's position; each occurrence gets its own row, and the repeats are reported
+        seen_ids = set()
+        for idx, pr_id, record, error in iter_source_extracted(source, jobs, cache_dir, manifest_file, fields,
+                                                                pr_filter, index_file):
+            if pr_id in seen_ids:
+                print(f"Warning: entry {pr_id} appears more than once in the input; row {idx} repeats it")
+            else:
+                seen_ids.add(pr_id)
+            if error is not None:
+                print(f"Error processing entry {pr_id}: {error}")
+                continue
+            if record is None:
+                filtered += 1
+                continue
+            try:
+                row = format_csv_row(idx, pr_id, record)
+                pickle_row = format_pickle_row(idx, pr_id, record)
+                if columns is not None:
+                    row = [row[position] for position in projection]
+                    pickle_row = [pickle_row[position] for position in projection]
+            except Exception as e:
+                # e.g. a file list holding something other than strings, which cannot be joined
+                print(f"Error processing entry {pr_id}: {e}")
+                continue
+            # print(f"Writing row for PR {pr_id}: {row}")  # Debug statement to check row data
+            write_csv_row(row)
+            write_pickle_row(pickle_row)
+            if write_sqlite_row is not None or write_side_tables is not None:
+                # The one-row-per-item tables are built once for both outputs
+                tables = explode_record(idx, pr_id, record)
+                if write_sqlite_row is not None:
+                    write_sqlite_row(idx, pr_id, record, tables)
+                if write_side_tables is not None:
+                    write_side_tables(tables)
+
+        print(f"Processed {idx} entries.")
+        if pr_filter is not None:
+            print(f"Skipped {filtered} entries that did not match the filters.")
 
-json_filename = sys.argv[1]
+    print(f"Data successfully saved to {pickle_filename}")
+    if sqlite_filename:
+        print(f"Data successfully saved to {sqlite_filename}")
+    if side_table_files:
+        print(f"Side tables saved to {', '.join(side_table_files.values())}")
+    if METRICS is not None:
+        METRICS.add_output("CSV", csv_filename)
+        METRICS.add_output("pickle", pickle_filename)
+        if sqlite_filename:
+            METRICS.add_output("SQLite", sqlite_filename)
+        for table, filename in side_table_files.items():
+            METRICS.add_output(f"{table} CSV", filename)
+    return idx
+#----------------------------------------------------------------------------------------------------------------------
+# End of function convert_file
+#----------------------------------------------------------------------------------------------------------------------
 
-# Extract base name without extension
-base_name = os.path.splitext(os.path.basename(json_filename))[0]
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to convert many repository dumps in one run
+# Input - pattern: a JSON file, a directory of JSON files, or a glob pattern such as "dumps/*.json"
+#         output_dir: the directory for the CSV and pickle files (and incremental manifests), "" for the current one
+#         jobs: the number of files converted at the same time, each in its own worker process
+#         merge_name: when given, the base name of a single merged CSV and pickle file instead of one per dump
+#         compression: None, or "gz", "xz" or "bz2" to compress the output files
+#         sqlite: True to also write a SQLite database per dump (or one merged database)
+#         full_text: True to build a full-text index in the SQLite databases
+#         side_tables: True to also write the comments, commits and files side tables of each dump (or merged ones)
+#         columns: an optional list of HEADER columns for the CSV and pickle rows
+#         pr_filter: an optional PRFilter selecting the PRs to convert
+# Output - the CSV and pickle files, with the entries and throughput of each dump printed as it finishes;
+#          convert_batch returns the total number of entries
+# Date: 10/17/2026
+# Modified to convert an existing file whose name has glob characters on its own instead of as a pattern
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def is_batch_input(pattern):
+    """Return True when pattern names a directory or is a glob pattern rather than a single existing file."""
+    # An existing file is converted on its own even when its name has glob characters, e.g. dump[1].json
+    return os.path.isdir(pattern) or (not os.path.isfile(pattern) and any(char in pattern for char in "*?["))
 
-# Construct CSV and pickle file names
-csv_filename = f"{base_name}.csv"
-pickle_filename = f"{base_name}.pkl"
 
-# Read the JSON file
-with open(json_filename, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+def resolve_inputs(pattern):
+    """Return the sorted list of JSON files named by a file name, a directory or a glob pattern."""
+    if os.path.isdir(pattern):
+        return sorted(name for extension in ["*.json"] + [f"*.json{suffix}" for suffix in COMPRESSED_OPENERS]
+                      for name in glob.glob(os.path.join(pattern, extension)))
+    if is_batch_input(pattern):
+        return sorted(glob.glob(pattern))
+    return [pattern]
 
-# Open the CSV file for writing
-with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
 
-    # Write the header
-    header = [
-        "Row #", "issue", "Pull Request", "issue text", "issue description",
-        "pull request text", "pull request description", "created_at", "closed_at", "userlogin", "author_name",
-        "comments", "files_changed", "commit_hashes", "newest_commit_hash"
-    ]
-    writer.writerow(header)
+def output_filenames(json_filename, output_dir="", compression=None):
+    """Return the CSV, pickle, manifest and SQLite file names matching the name of a JSON file."""
+    # Extract base name without extension, and without the compression suffix of a .json.gz name
+    base_name = os.path.basename(json_filename)
+    base_name = os.path.splitext(base_name[:len(base_name) - len(compression_suffix(base_name))])[0]
+    base_name = os.path.join(output_dir, base_name)
+    suffix = COMPRESSION_SUFFIXES[compression] if compression else ""
+    return (f"{base_name}.csv{suffix}", f"{base_name}.pkl{suffix}", f"{base_name}.manifest.sqlite",
+            f"{base_name}.sqlite")
 
-    # Write the data rows
-    for idx, pr_id in enumerate(data.keys(), start=1):
-        try:
-            pr = data[pr_id]
-            row_data = extract_data(pr)
-            row = [idx, pr_id] + [row_data.get(col, "") for col in header[2:]]
-            # print(f"Writing row for PR {pr_id}: {row}")  # Debug statement to check row data
+
+def _convert_batch_file(json_filename, csv_filename, pickle_filename, cache_dir, manifest_file, sqlite_filename,
+                        full_text, side_tables, columns, pr_filter):
+    start = time.perf_counter()
+    entries = convert_file(json_filename, csv_filename, pickle_filename, 1, cache_dir, manifest_file, sqlite_filename,
+                           full_text, side_tables, columns, pr_filter)
+    return entries, time.perf_counter() - start
+
+
+def _append_csv(writer, part_filename, offset, row_position=0):
+    with open_input(part_filename) as part:
+        reader = csv.reader(part)
+        next(reader, None)  # Skip the header
+        if row_position is None:
+            writer.writerows(reader)
+            return
+        for row in reader:
+            row[row_position] = int(row[row_position]) + offset
             writer.writerow(row)
-        except Exception as e:
-            print(f"Error processing entry {pr_id}: {e}")
 
-    print(f"Processed {idx} entries.")
 
-    # Convert to pickle
-    convert_to_pickle(data, pickle_filename)
+def merge_outputs(parts, csv_filename, pickle_filename, sqlite_filename=None, full_text=False, side_tables=False,
+                  columns=None):
+    """Concatenate per-dump CSV, pickle, SQLite and side table files into one set, numbering the rows continuously."""
+    offset = 0
+    with ExitStack() as outputs:
+        f = outputs.enter_context(open_output(csv_filename))
+        pickle_writer = outputs.enter_context(PickleRowWriter(pickle_filename))
+        sqlite_writer = None
+        if sqlite_filename:
+            sqlite_writer = outputs.enter_context(SQLiteRowWriter(sqlite_filename, full_text=full_text))
+        side_table_writer = outputs.enter_context(SideTableWriter(csv_filename)) if side_tables else None
+        writer = csv.writer(f)
+        writer.writerow(HEADER if columns is None else columns)
+        # The position of the Row # column, which may be left out or moved by columns
+        row_position = 0
+        if columns is not None:
+            row_position = columns.index("Row #") if "Row #" in columns else None
+        for part_csv, part_pickle, part_sqlite, entries in parts:
+            _append_csv(writer, part_csv, offset, row_position)
+            if side_table_writer is not None:
+                for table, part_filename in side_table_filenames(part_csv).items():
+                    _append_csv(side_table_writer.writers[table], part_filename, offset)
+            for row in iter_pickle_rows(part_pickle):
+                if row_position is not None:
+                    row[row_position] += offset
+                pickle_writer.write(row)
+            if sqlite_writer is not None:
+                sqlite_writer.append_database(part_sqlite, offset)
+            offset += entries
+    return offset
+
+
+def convert_batch(pattern, output_dir="", jobs=1, merge_name=None, cache_dir=None, incremental=False,
+                  compression=None, sqlite=False, full_text=False, side_tables=False, columns=None, pr_filter=None):
+    """Convert every dump matched by pattern, largest first, on a pool of jobs worker processes."""
+    json_filenames = resolve_inputs(pattern)
+    if not json_filenames:
+        raise FileNotFoundError(f"No JSON files match {pattern}")
+    base_names = [os.path.basename(output_filenames(name)[0]) for name in json_filenames]
+    if len(set(base_names)) != len(base_names):
+        raise ValueError("Several input files have the same name, so their outputs would overwrite each other")
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_dir or ".") as parts_dir:
+        # Per-dump files go straight to output_dir, or to a temporary directory when they are merged afterwards
+        part_dir = parts_dir if merge_name else output_dir
+        sizes = {name: os.path.getsize(name) for name in json_filenames}
+        results = {}
+        total_start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {}
+            # Start the largest dumps first so one big repository does not finish long after the rest
+            for json_filename in sorted(json_filenames, key=sizes.get, reverse=True):
+                csv_filename, pickle_filename, _, sqlite_filename = output_filenames(
+                    json_filename, part_dir, compression)
+                manifest_file = output_filenames(json_filename, output_dir)[2] if incremental else None
+                if not sqlite:
+                    sqlite_filename = None
+                # A merged database gets its index once the parts are merged
+                future = executor.submit(_convert_batch_file, json_filename, csv_filename, pickle_filename,
+                                         cache_dir, manifest_file, sqlite_filename, full_text and not merge_name,
+                                         side_tables, columns, pr_filter)
+                futures[future] = (json_filename, csv_filename, pickle_filename, sqlite_filename)
+
+            for future in as_completed(futures):
+                json_filename, csv_filename, pickle_filename, sqlite_filename = futures[future]
+                entries, seconds = future.result()
+                results[json_filename] = (csv_filename, pickle_filename, sqlite_filename, entries)
+                megabytes = sizes[json_filename] / 1e6
+                print(f"{json_filename}: {entries} entries, {megabytes:.1f} MB in {seconds:.2f}s "
+                      f"({entries / seconds if seconds else 0:.0f} PRs/s, {megabytes / seconds if seconds else 0:.1f} MB/s)")
+
+        total = sum(entries for _, _, _, entries in results.values())
+        if merge_name:
+            merged_csv, merged_pickle, _, merged_sqlite = output_filenames(merge_name, output_dir, compression)
+            if not sqlite:
+                merged_sqlite = None
+            merge_outputs([results[name] for name in json_filenames], merged_csv, merged_pickle, merged_sqlite,
+                          full_text, side_tables, columns)
+            print(f"Merged {len(json_filenames)} dumps into {merged_csv} and {merged_pickle}"
+                  + (f" and {merged_sqlite}" if merged_sqlite else ""))
+
+    seconds = time.perf_counter() - total_start
+    megabytes = sum(sizes.values()) / 1e6
+    print(f"Converted {len(json_filenames)} dumps, {total} entries, {megabytes:.1f} MB in {seconds:.2f}s "
+          f"({total / seconds if seconds else 0:.0f} PRs/s, {megabytes / seconds if seconds else 0:.1f} MB/s)")
+    return total
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for batch conversion
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Main script to convert the JSON file named on the command line
+# Input - JSON file (jabref_output.json) containing pull request data
+# Output - CSV file (jabref_output.csv) and pickle file (jabref_output.pkl) with processed pull request data
+# Written by Adonijah Farner
+# Modified to run from a main function so this file can be imported as a library, and to accept --jobs,
+# --cache-dir, --incremental, --metrics, --compress, --sqlite, --fts, --search, --side-tables, --columns, the
+# --since, --until, --prs-only and --user filters, and batch conversion of directories or glob patterns
+# Date: 10/17/2026
+# Modified to keep the --pr index in the output directory, and to read by byte range only with --index
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def main(argv=None):
+    # ----------------------------------------------------------------------------------------------------------------------
+    # Modified to read file from command line and have pickle and csv file name match json file name
+    # Date: 6/10/2024
+    # Modified by Adonijah Farner
+    # ----------------------------------------------------------------------------------------------------------------------
+    parser = argparse.ArgumentParser(prog="JSONToCSV.py", description="Convert a JSON dump of pull requests to CSV and pickle.")
+    parser.add_argument("filename", help="the JSON file to convert, or a directory or quoted glob pattern of dumps")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="number of workers for extraction, or of processes for files in batch mode "
+                             "(0 uses every CPU, default 1)")
+    parser.add_argument("--output-dir", metavar="DIR", default="",
+                        help="directory for the output files (default: the current directory)")
+    parser.add_argument("--compress", choices=sorted(COMPRESSION_SUFFIXES),
+                        help="compress the CSV and pickle outputs (the input is decompressed from its .gz, .xz "
+                             "or .bz2 suffix automatically)")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="also write the PRs to <name>.sqlite, with tables for PRs, linked issues, comments, "
+                             "commits and files")
+    parser.add_argument("--fts", action="store_true",
+                        help="build a full-text index of the titles, descriptions and comments in the SQLite "
+                             "database (implies --sqlite)")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="search the full-text index of the database given as filename and print the matching "
+                             "PR ids with snippets")
+    parser.add_argument("--limit", type=int, default=20, help="the number of --search results (default 20)")
+    parser.add_argument("--pr", metavar="ID", action="append",
+                        help="print the CSV row of this PR only, read through a byte-offset index of the JSON file "
+                             "(built on first use as <name>.index.sqlite in the output directory); may be given "
+                             "several times")
+    parser.add_argument("--index", action="store_true",
+                        help="with --jobs, have the workers read their PRs from the JSON file by byte range, through "
+                             "the --pr index in the output directory, instead of decoding the file here")
+    parser.add_argument("--executor", choices=EXECUTOR_KINDS, default="auto",
+                        help="run the --jobs workers as threads or processes; auto (the default) uses threads on "
+                             "free-threaded Python builds and processes otherwise")
+    parser.add_argument("--shared-memory", action="store_true",
+                        help="have the --jobs workers return their extracted rows through shared memory segments "
+                             "instead of the process pool's pipes")
+    parser.add_argument("--pipeline", action=argparse.BooleanOptionalAction, default=None,
+                        help="read the input ahead and write each output on background threads while the PRs are "
+                             "extracted (default: off)")
+    parser.add_argument("--side-tables", action="store_true",
+                        help="also write <name>.comments.csv, <name>.commits.csv and <name>.files.csv with one row "
+                             "per comment, commit and changed file")
+    parser.add_argument("--columns", metavar="COLUMNS",
+                        help="comma separated CSV columns to write, e.g. \"issue,created_at,closed_at,files_changed\"; "
+                             "the fields of the other columns are not extracted")
+    parser.add_argument("--since", metavar="DATE",
+                        help="only convert PRs created at or after DATE (e.g. 2024-01-01 or 2024-01-01T12:00:00Z)")
+    parser.add_argument("--until", metavar="DATE", help="only convert PRs created before DATE")
+    parser.add_argument("--prs-only", action="store_true", help="only convert entries whose is_pr is true")
+    parser.add_argument("--user", metavar="LOGIN", action="append",
+                        help="only convert PRs opened by this userlogin; may be given several times")
+    parser.add_argument("--merge", metavar="NAME",
+                        help="in batch mode, write one merged NAME.csv and NAME.pkl instead of one pair per dump")
+    reuse = parser.add_mutually_exclusive_group()
+    reuse.add_argument("--cache-dir", metavar="DIR",
+                       help="reuse the extracted rows of an unchanged input file from this directory")
+    reuse.add_argument("--incremental", action="store_true",
+                       help="only extract the PRs added or changed since the last run, tracked in <name>.manifest.sqlite")
+    parser.add_argument("--metrics", action="store_true",
+                        help="print the time and calls spent in each stage of the conversion")
+    parser.add_argument("--metrics-file", metavar="FILE", help="also save the metrics as JSON to FILE")
+    args = parser.parse_args(argv)
+
+    if args.search is not None:
+        start = time.perf_counter()
+        try:
+            results = search(args.filename, args.search, args.limit)
+        except sqlite3.OperationalError as e:
+            parser.error(f"invalid search query: {e}")
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        for result in results:
+            print(f"{result.pr_id}\t{result.snippet}")
+        print(f"{len(results)} matching PRs in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return
+    if args.fts:
+        args.sqlite = True
+    columns = None
+    if args.columns is not None:
+        columns = [column.strip() for column in args.columns.split(",")]
+        try:
+            column_fields(columns)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.sqlite or args.side_tables:
+            parser.error("--columns only applies to the CSV and pickle outputs, not to --sqlite, --fts or --side-tables")
+    try:
+        pr_filter = make_pr_filter(args.since, args.until, args.prs_only, args.user)
+    except ValueError as e:
+        parser.error(f"invalid date for --since or --until: {e}")
+
+    # Kept with the outputs rather than next to the input, which may be in a shared or read-only directory
+    index_file = os.path.join(args.output_dir, os.path.basename(index_filename(args.filename)))
+    if args.pr:
+        start = time.perf_counter()
+        # The CSV goes to stdout, so it can be piped; every other message goes to stderr
+        try:
+            if args.output_dir:
+                os.makedirs(args.output_dir, exist_ok=True)
+            open_index(args.filename, index_file).close()
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        projection = [HEADER.index(column) for column in columns] if columns is not None else None
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns if columns is not None else HEADER)
+        found = 0
+        for pr_id in args.pr:
+            try:
+                row_number, pr_id, record = extract_pr(args.filename, pr_id, index_file, columns)
+                row = format_csv_row(row_number, pr_id, record)
+            except KeyError:
+                print(f"No entry {pr_id} in {args.filename}", file=sys.stderr)
+                continue
+            except Exception as e:
+                print(f"Error processing entry {pr_id}: {e}", file=sys.stderr)
+                continue
+            writer.writerow([row[position] for position in projection] if projection is not None else row)
+            found += 1
+        print(f"{found} PRs read in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+        return
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    use_executor(args.executor)
+    if args.shared_memory:
+        use_shared_results()
+    if args.pipeline is not None:
+        use_pipeline(args.pipeline)
+    batch = is_batch_input(args.filename)
+    if batch and (args.metrics or args.metrics_file):
+        parser.error("--metrics is only available when converting a single file")
+    if batch and args.index:
+        parser.error("--index is only available when converting a single file")
+    if args.merge and not batch:
+        parser.error("--merge needs a directory or glob pattern of dumps")
+
+    if batch:
+        convert_batch(args.filename, args.output_dir, jobs, args.merge, args.cache_dir, args.incremental,
+                      args.compress, args.sqlite, args.fts, args.side_tables, columns, pr_filter)
+        return
+
+    json_filename = args.filename
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # Construct CSV and pickle file names
+    csv_filename, pickle_filename, manifest_filename, sqlite_filename = output_filenames(
+        json_filename, args.output_dir, args.compress)
+    if not args.incremental:
+        manifest_filename = None
+    if not args.sqlite:
+        sqlite_filename = None
+
+    if args.metrics or args.metrics_file:
+        enable_metrics()
+
+    convert_file(json_filename, csv_filename, pickle_filename, jobs, args.cache_dir, manifest_filename, sqlite_filename,
+                 args.fts, args.side_tables, columns, pr_filter, index_file if args.index else None)
+
+    if METRICS is not None:
+        print(METRICS.report())
+        if args.metrics_file:
+            METRICS.save(args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
 #----------------------------------------------------------------------------------------------------------------------
 # End of main script
 #----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,441 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak memory is then reported as None
+    resource = None
+
+import JSONToCSV
+
+#----------------------------------------------------------------------------------------------------------------------
+# Benchmarks for JSONToCSV.py
+# Generates synthetic PR dumps and measures the throughput of the extraction functions (micro benchmarks) and
+# of whole conversions (macro benchmarks). Results are printed as JSON so runs can be saved and compared:
+#   python benchmark.py generate corpus.json --prs 100000
+#   python benchmark.py run --prs 20000 --output before.json
+#   python benchmark.py compare before.json after.json
+#   python benchmark.py scaling --prs 20000 --jobs 2 --jobs 4
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to generate a synthetic JSON dump of pull requests
+# Input - out: a text file to write the dump to
+#         prs: the number of PRs
+#         body_size: the average number of characters in a PR body or comment
+#         comments: the average number of comments per PR
+#         commits: the average number of commits per PR
+#         files: the average number of files per commit
+#         seed: the random seed; the same arguments always produce the same file
+# Output - the dump written to out, one PR at a time so millions of PRs never have to fit in memory
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+WORDS = [
+    "the", "parser", "in", "fix", "update", "test", "when", "null", "handle", "entry", "field", "export",
+    "import", "library", "to", "and", "preferences", "dialog", "search", "group", "crash", "on", "open", "file",
+]
+LINK_KEYWORDS = ["closes", "fixes", "resolves", "Fixes", "related to", "in", "adds", "refs"]
+START_DATE = datetime(2015, 1, 1)
+
+
+def _sentence_text(rng, size):
+    """Build about size characters of text with occasional issue references."""
+    parts = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.04:
+            if rng.random() < 0.7:
+                part = f"{rng.choice(LINK_KEYWORDS)} #{rng.randint(1, 20000)}"
+            else:
+                part = f"{rng.choice(LINK_KEYWORDS)} https://github.com/org/repo/issues/{rng.randint(1, 20000)}"
+        else:
+            part = rng.choice(WORDS)
+        if rng.random() < 0.02:
+            part += "\n"
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+
+def _around(rng, average):
+    return rng.randint(0, 2 * average) if average > 0 else 0
+
+
+def _timestamp(date):
+    return date.strftime(JSONToCSV.COMMIT_DATE_FORMAT)
+
+
+def generate_pr(rng, body_size, comments, commits, files):
+    """Build one synthetic PR dictionary in the layout of the mined dumps."""
+    created = START_DATE + timedelta(seconds=rng.randint(0, 10 * 365 * 86400))
+    pr = {
+        "title": _sentence_text(rng, 40),
+        "body": _sentence_text(rng, _around(rng, body_size)) if rng.random() < 0.9 else None,
+        "is_pr": rng.random() < 0.7,
+        "created_at": _timestamp(created),
+        "closed_at": _timestamp(created + timedelta(hours=rng.randint(1, 2000))) if rng.random() < 0.8 else None,
+        "userlogin": f"user{rng.randint(1, 500)}",
+        "comments": {},
+        "commits": {},
+    }
+    for _ in range(_around(rng, comments)):
+        comment_id = str(rng.getrandbits(40))
+        pr["comments"][comment_id] = {
+            "userlogin": f"user{rng.randint(1, 500)}",
+            "body": _sentence_text(rng, _around(rng, body_size // 2)),
+        }
+    for _ in range(_around(rng, commits)):
+        sha = "%040x" % rng.getrandbits(160)
+        pr["commits"][sha] = {
+            "sha": sha,
+            "author_name": f"Author {rng.randint(1, 300)}",
+            "date": _timestamp(created + timedelta(minutes=rng.randint(0, 20000))),
+            "files": {"file_list": [f"src/module{rng.randint(1, 80)}/File{rng.randint(1, 400)}.java"
+                                    for _ in range(_around(rng, files))]},
+        }
+    return pr
+
+
+def generate_corpus(out, prs, body_size=800, comments=4, commits=3, files=3, seed=0):
+    """Write a synthetic {pr_id: pr} dump with prs entries to the text file out."""
+    rng = random.Random(seed)
+    out.write("{")
+    for number in range(1, prs + 1):
+        if number > 1:
+            out.write(",\n")
+        pr = generate_pr(rng, body_size, comments, commits, files)
+        out.write(f"{json.dumps(str(number))}: {json.dumps(pr)}")
+    out.write("}\n")
+#----------------------------------------------------------------------------------------------------------------------
+# End of function generate_corpus
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to time the extraction functions on a sample of synthetic PRs
+# Input - sample: a list of PR dictionaries
+#         repeat: the number of times each measurement is taken; the fastest is reported
+# Output - a dictionary of results per function with calls/s and MB/s of text processed
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def _best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_micro(sample, repeat=3):
+    """Time clean_text, find_linked_issues, parse_commit_date, extract_data and the JSON reader."""
+    bodies = [JSONToCSV.clean_text(pr.get("body")) for pr in sample]
+    dates = [commit["date"] for pr in sample for commit in pr["commits"].values()]
+    text = json.dumps({str(number): pr for number, pr in enumerate(sample)})
+    body_mb = sum(len(body) for body in bodies) / 1e6
+    text_mb = len(text.encode('utf-8')) / 1e6
+
+    def clean_all():
+        for pr in sample:
+            JSONToCSV.clean_text(pr.get("body"))
+
+    def find_all():
+        for body in bodies:
+            JSONToCSV.find_linked_issues(body)
+
+    def parse_all():
+        for date in dates:
+            JSONToCSV.parse_commit_date(date)
+
+    def extract_all():
+        for pr in sample:
+            JSONToCSV.extract_data(pr)
+
+    def read_all():
+        for _ in JSONToCSV.iter_json_object(_StringReader(text)):
+            pass
+
+    results = {}
+    for name, function, calls, megabytes in [
+        ("clean_text", clean_all, len(sample), body_mb),
+        ("find_linked_issues", find_all, len(bodies), body_mb),
+        ("parse_commit_date", parse_all, len(dates), None),
+        ("extract_data", extract_all, len(sample), text_mb),
+        ("iter_json_object", read_all, len(sample), text_mb),
+    ]:
+        seconds = _best_time(function, repeat)
+        results[name] = {
+            "calls": calls,
+            "seconds": round(seconds, 6),
+            "calls_per_s": round(calls / seconds, 1) if seconds else None,
+            "mb_per_s": round(megabytes / seconds, 3) if megabytes and seconds else None,
+        }
+    return results
+
+
+class _StringReader:
+    """A minimal file-like object over a string, without io.StringIO's copy of the whole text."""
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def read(self, size):
+        chunk = self.text[self.pos:self.pos + size]
+        self.pos += len(chunk)
+        return chunk
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for micro benchmarks
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Functions to time a whole conversion of a dump in a fresh process
+# Input - json_filename: the dump to convert
+#         extra_args: extra command line arguments for JSONToCSV.py, such as ["--jobs", "4"]
+# Output - a dictionary with the wall time, PRs/s, MB/s of input and the peak resident memory of the process
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_macro(json_filename, prs, extra_args=()):
+    """Run one conversion of json_filename in a child process and report its throughput."""
+    size_mb = os.path.getsize(json_filename) / 1e6
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as work_dir:
+        completed = subprocess.run(
+            [sys.executable, script, "_convert", os.path.abspath(json_filename), *extra_args],
+            cwd=work_dir, capture_output=True, text=True, check=True,
+        )
+    measured = json.loads(completed.stdout.strip().splitlines()[-1])
+    seconds = measured["seconds"]
+    return {
+        "args": list(extra_args),
+        "prs": prs,
+        "input_mb": round(size_mb, 3),
+        "seconds": round(seconds, 4),
+        "prs_per_s": round(prs / seconds, 1),
+        "mb_per_s": round(size_mb / seconds, 3),
+        "peak_rss_kb": measured["peak_rss_kb"],
+    }
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for macro benchmarks
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to measure how a conversion scales with the number of workers
+# Input - json_filename: the dump to convert
+#         prs: the number of PRs in the dump
+#         jobs_counts: the numbers of workers to try, such as [2, 4, 8]
+#         executors: the --executor kinds to try, "threads" and/or "processes"
+# Output - a list of macro results, the serial conversion first, each with its speedup over the serial one
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def default_jobs_counts():
+    """Return 2, 4, 8, ... up to the number of CPUs, plus the number of CPUs itself."""
+    cpus = os.cpu_count() or 1
+    counts = []
+    jobs = 2
+    while jobs < cpus:
+        counts.append(jobs)
+        jobs *= 2
+    counts.append(max(cpus, 2))
+    return counts
+
+
+def run_scaling(json_filename, prs, jobs_counts, executors):
+    """Time the conversion of json_filename serially and with each worker count and executor."""
+    if not JSONToCSV.compression_suffix(json_filename):
+        # Build the byte-offset index the workers read through up front, so no run pays for it
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                JSONToCSV.open_index(json_filename).close()
+        except (OSError, sqlite3.Error):
+            pass  # The runs fall back to sending decoded PRs to the workers
+    serial = run_macro(json_filename, prs)
+    serial["speedup"] = 1.0
+    results = [serial]
+    for executor in executors:
+        for jobs in jobs_counts:
+            result = run_macro(json_filename, prs, ["--jobs", str(jobs), "--executor", executor])
+            result["speedup"] = round(result["prs_per_s"] / serial["prs_per_s"], 3)
+            results.append(result)
+    return results
+#----------------------------------------------------------------------------------------------------------------------
+# End of functions for scaling benchmarks
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Function to compare two saved benchmark results
+# Input - before, after: dictionaries loaded from the JSON written by "run"
+# Output - prints the speedup of every throughput figure found in both
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def compare_results(before, after):
+    """Print after/before ratios for the throughput figures of two benchmark runs."""
+    for name, result in before.get("micro", {}).items():
+        if name in after.get("micro", {}) and result["calls_per_s"]:
+            ratio = after["micro"][name]["calls_per_s"] / result["calls_per_s"]
+            print(f"micro {name:<20} {ratio:6.2f}x")
+    after_macro = {" ".join(result["args"]): result for result in after.get("macro", [])}
+    for result in before.get("macro", []):
+        label = " ".join(result["args"])
+        if label in after_macro:
+            ratio = after_macro[label]["prs_per_s"] / result["prs_per_s"]
+            memory = ""
+            if result["peak_rss_kb"] and after_macro[label]["peak_rss_kb"]:
+                memory = f"  peak memory {after_macro[label]['peak_rss_kb'] / result['peak_rss_kb']:5.2f}x"
+            print(f"macro {label or '(serial)':<20} {ratio:6.2f}x{memory}")
+#----------------------------------------------------------------------------------------------------------------------
+# End of function compare_results
+#----------------------------------------------------------------------------------------------------------------------
+
+#----------------------------------------------------------------------------------------------------------------------
+# Main script
+# Date: 10/17/2026
+#----------------------------------------------------------------------------------------------------------------------
+def _add_corpus_arguments(parser):
+    parser.add_argument("--prs", type=int, default=10000, help="number of PRs (default 10000)")
+    parser.add_argument("--body-size", type=int, default=800, help="average characters per body (default 800)")
+    parser.add_argument("--comments", type=int, default=4, help="average comments per PR (default 4)")
+    parser.add_argument("--commits", type=int, default=3, help="average commits per PR (default 3)")
+    parser.add_argument("--files", type=int, default=3, help="average files per commit (default 3)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+
+
+def _corpus_options(args):
+    return dict(body_size=args.body_size, comments=args.comments, commits=args.commits,
+                files=args.files, seed=args.seed)
+
+
+def _corpus_file(args, corpus_dir):
+    # The dump given with --input, or a generated one in corpus_dir; returns (filename, PRs, corpus description)
+    if args.input is None:
+        json_filename = os.path.join(corpus_dir, "corpus.json")
+        with open(json_filename, 'w', encoding='utf-8') as out:
+            generate_corpus(out, args.prs, **_corpus_options(args))
+        return json_filename, args.prs, dict(_corpus_options(args), prs=args.prs)
+    with open(args.input, 'r', encoding='utf-8') as f:
+        prs = sum(1 for _ in JSONToCSV.iter_json_object(f))
+    return args.input, prs, {"input": args.input, "prs": prs}
+
+
+def _write_report(results, output):
+    report = json.dumps(results, indent=2)
+    print(report)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Benchmarks for JSONToCSV.py.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic PR dump")
+    generate.add_argument("filename")
+    _add_corpus_arguments(generate)
+
+    run = commands.add_parser("run", help="run the micro and macro benchmarks and print the results as JSON")
+    _add_corpus_arguments(run)
+    run.add_argument("--input", help="benchmark an existing dump instead of a generated one")
+    run.add_argument("--sample", type=int, default=2000, help="PRs used by the micro benchmarks (default 2000)")
+    run.add_argument("--repeat", type=int, default=3, help="repetitions of each micro benchmark (default 3)")
+    run.add_argument("--jobs", type=int, action="append", default=[],
+                     help="also run the macro benchmark with --jobs N (repeatable)")
+    run.add_argument("--output", help="also write the results to this file")
+
+    scaling = commands.add_parser("scaling", help="time conversions with more and more workers, as threads and as "
+                                                  "processes, and print the speedups as JSON")
+    _add_corpus_arguments(scaling)
+    scaling.add_argument("--input", help="benchmark an existing dump instead of a generated one")
+    scaling.add_argument("--jobs", type=int, action="append", default=[],
+                         help="a number of workers to try (repeatable; default 2, 4, ... up to the CPU count)")
+    scaling.add_argument("--executor", choices=["threads", "processes"], action="append", default=[],
+                         help="an executor to try (repeatable; default both)")
+    scaling.add_argument("--output", help="also write the results to this file")
+
+    compare = commands.add_parser("compare", help="compare two result files written by run")
+    compare.add_argument("before")
+    compare.add_argument("after")
+
+    convert = commands.add_parser("_convert")  # Used internally to measure one conversion in a fresh process
+    convert.add_argument("filename")
+    convert.add_argument("extra", nargs=argparse.REMAINDER)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        with open(args.filename, 'w', encoding='utf-8') as out:
+            generate_corpus(out, args.prs, **_corpus_options(args))
+        print(f"Wrote {args.prs} PRs to {args.filename}")
+
+    elif args.command == "_convert":
+        with open(os.devnull, 'w') as devnull:
+            stdout = sys.stdout
+            sys.stdout = devnull
+            try:
+                start = time.perf_counter()
+                JSONToCSV.main([args.filename] + args.extra)
+                elapsed = time.perf_counter() - start
+            finally:
+                sys.stdout = stdout
+        print(json.dumps({"seconds": elapsed, "peak_rss_kb": _peak_rss_kb()}))
+
+    elif args.command == "scaling":
+        results = {
+            "python": sys.version.split()[0],
+            "free_threaded": JSONToCSV.free_threaded(),
+            "cpus": os.cpu_count(),
+        }
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            json_filename, prs, results["corpus"] = _corpus_file(args, corpus_dir)
+            results["scaling"] = run_scaling(json_filename, prs, args.jobs or default_jobs_counts(),
+                                             args.executor or ["threads", "processes"])
+        _write_report(results, args.output)
+
+    elif args.command == "compare":
+        with open(args.before, 'r', encoding='utf-8') as f:
+            before = json.load(f)
+        with open(args.after, 'r', encoding='utf-8') as f:
+            after = json.load(f)
+        compare_results(before, after)
+
+    else:
+        rng = random.Random(args.seed)
+        options = _corpus_options(args)
+        sample = [generate_pr(rng, options["body_size"], options["comments"], options["commits"], options["files"])
+                  for _ in range(args.sample)]
+        results = {
+            "python": sys.version.split()[0],
+            "micro": run_micro(sample, args.repeat),
+            "macro": [],
+        }
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            json_filename, prs, results["corpus"] = _corpus_file(args, corpus_dir)
+            results["macro"].append(run_macro(json_filename, prs))
+            for jobs in args.jobs:
+                results["macro"].append(run_macro(json_filename, prs, ["--jobs", str(jobs)]))
+        _write_report(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
+#----------------------------------------------------------------------------------------------------------------------
+# End of main script
+#----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONToCSV
+
+
+class DateBoundTest(unittest.TestCase):
+    """--since and --until have to compare like the moments they name, whatever ISO layout they are given in."""
+
+    def test_normalize_date_bound(self):
+        cases = {
+            "2024-01-01": "2024-01-01T00:00:00Z",
+            "20240101": "2024-01-01T00:00:00Z",
+            "2024-W01": "2024-01-01T00:00:00Z",
+            "2024-01-01 12:00": "2024-01-01T12:00:00Z",
+            "2024-01-01T12:00:00Z": "2024-01-01T12:00:00Z",
+            "2024-01-01T12:00:00+05:00": "2024-01-01T07:00:00Z",
+            "2023-12-31T23:30:00-01:00": "2024-01-01T00:30:00Z",
+            # created_at has whole seconds, so a fraction selects the same PRs as the next second
+            "2024-01-01T12:00:00.5Z": "2024-01-01T12:00:01Z",
+        }
+        for bound, expected in cases.items():
+            with self.subTest(bound=bound):
+                self.assertEqual(JSONToCSV.normalize_date_bound(bound), expected)
+
+    def test_invalid_bounds_are_rejected(self):
+        for bound in ["2024-13-01", "yesterday", ""]:
+            with self.subTest(bound=bound):
+                with self.assertRaises(ValueError):
+                    JSONToCSV.make_pr_filter(since=bound)
+
+    def test_bounds_select_by_moment(self):
+        pr_filter = JSONToCSV.make_pr_filter(since="2024-01-01 12:00", until="2024-01-02T00:00:00+02:00")
+        accepted = {created_at: JSONToCSV.accepts_pr(pr_filter, {"created_at": created_at}) for created_at in [
+            "2024-01-01T01:00:00Z", "2024-01-01T12:00:00Z", "2024-01-01T21:59:59Z", "2024-01-01T22:00:00Z"]}
+        self.assertEqual(accepted, {"2024-01-01T01:00:00Z": False, "2024-01-01T12:00:00Z": True,
+                                    "2024-01-01T21:59:59Z": True, "2024-01-01T22:00:00Z": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONToCSV
+
+# Keys outside ASCII, written as UTF-8 or as escapes, values with braces, quotes and escapes in their strings,
+# and CRLF line ends, so every byte offset has to count bytes rather than characters
+DOCUMENT = ('{"1": {"title": "a } b", "body": "\\"{\\" caf\\u00e9"},\r\n'
+            ' "ü2" : {"title": "日本語", "nested": {"x": [1, {"y": "]"}]}},\r\n'
+            ' "\\u00e93": {"title": "escaped key"},\r\n'
+            ' "4": {"title": "last"}}\r\n')
+
+
+class ByteOffsetIndexTest(unittest.TestCase):
+    """read_pr has to return what json.load returns for each entry, and rebuild a stale index."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.json_filename = os.path.join(directory.name, "dump.json")
+        self.index_file = os.path.join(directory.name, "dump.index.sqlite")
+        self.write(DOCUMENT)
+
+    def write(self, document):
+        with open(self.json_filename, 'w', encoding='utf-8', newline='') as out:
+            out.write(document)
+
+    def read_all(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return {pr_id: JSONToCSV.read_pr(self.json_filename, pr_id, self.index_file)
+                    for pr_id in json.loads(DOCUMENT)}
+
+    def test_entries_match_json_load(self):
+        expected = {pr_id: (row_number, pr) for row_number, (pr_id, pr) in enumerate(json.loads(DOCUMENT).items(), 1)}
+        self.assertEqual(self.read_all(), expected)
+        with self.assertRaises(KeyError):
+            JSONToCSV.read_pr(self.json_filename, "5", self.index_file)
+
+    def test_changed_file_is_indexed_again(self):
+        self.read_all()
+        self.write(DOCUMENT.replace('"last"', '"changed later"'))
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(JSONToCSV.read_pr(self.json_filename, "4", self.index_file),
+                             (4, {"title": "changed later"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONToCSV
+
+
+def original_find_linked_issues(body_text):
+    """find_linked_issues as it was before the single-scan matcher, one re.findall per keyword."""
+    keywords = [
+        "closes", "fixes", "resolves", "in", "solves",
+        "addresses", "completes", "connects", "related to", "reverts",
+        "implements", "references", "incorporates", "updates", "handles",
+        "patches", "adds", "modifies", "enhances", "improves", "adjusts"
+    ]
+    linked_issues = []
+    description_keywords = []
+
+    for keyword in keywords:
+        pattern = fr'{keyword} (#\d+|https://github\.com/\S+/issues/\d+)'
+        matches = re.findall(pattern, body_text, re.IGNORECASE)
+
+        for match in matches:
+            linked_issues.append(match)
+            description_keywords.append(keyword)
+
+    return linked_issues, description_keywords
+
+
+# Pieces that combine into the cases the matcher has to get right: keywords ending inside other words
+# (resolves/solves, within), any case, characters that only match under Unicode case folding (the long s and
+# the Kelvin sign), issue numbers and links, and separators that are not a single space
+PIECES = [
+    "closes", "Fixes", "RESOLVES", "solves", "in", "within", "related to", "Related  to", "reverts", "adds",
+    "improves", "re", "so", "ſolves", "fixeſ", "Keeps", "İn", "x", "PR", "the", "#", "#12", "#7", "#0042",
+    "https://github.com/org/repo/issues/15", "https://github.com/a/b/pull/3", "https://github.com/x/issues/",
+    "https://github.com/o/r/issues/9x", ",", ".", "(", ")", ":", "é",
+]
+# What follows each piece: mostly the single space the keyword patterns need, sometimes other whitespace
+SEPARATORS = [" ", " ", " ", " ", "", "  ", "\t", "\n", "\u00a0"]
+
+
+class FindLinkedIssuesTest(unittest.TestCase):
+    """find_linked_issues has to return what the per-keyword implementation returned, in the same order."""
+
+    def assertSameAsOriginal(self, body_text):
+        self.assertEqual(JSONToCSV.find_linked_issues(body_text), original_find_linked_issues(body_text),
+                         f"body: {body_text!r}")
+
+    def test_examples(self):
+        for body_text in ["", "Fixes #1", "resolves #2 and solves #3", "related to #4, in #5",
+                          "See https://github.com/org/repo/issues/10 which this closes #11",
+                          "ſolves #6 Keeps #7", "fixes#8 fixes  #9 fixes #x"]:
+            with self.subTest(body_text=body_text):
+                self.assertSameAsOriginal(body_text)
+
+    def test_random_bodies(self):
+        rng = random.Random(2024)
+        for _ in range(20000):
+            self.assertSameAsOriginal("".join(rng.choice(PIECES) + rng.choice(SEPARATORS)
+                                              for _ in range(rng.randint(0, 30))))
+
+
+if __name__ == "__main__":
+    unittest.main()
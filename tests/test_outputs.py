@@ -0,0 +1,92 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONToCSV
+import benchmark
+
+
+class OutputEquivalenceTest(unittest.TestCase):
+    """Every way of running a conversion has to write the same CSV and pickle files as a serial run."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.json_filename = os.path.join(cls.directory, "corpus.json")
+        with open(cls.json_filename, 'w', encoding='utf-8') as out:
+            benchmark.generate_corpus(out, 400, body_size=300, seed=7)
+        cls.expected = cls.convert("serial")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    @classmethod
+    def convert(cls, name, source=None, **options):
+        """Convert the corpus and return the bytes of the CSV and pickle files."""
+        csv_filename = os.path.join(cls.directory, f"{name}.csv")
+        pickle_filename = os.path.join(cls.directory, f"{name}.pkl")
+        with contextlib.redirect_stdout(io.StringIO()):
+            JSONToCSV.convert_file(source or cls.json_filename, csv_filename, pickle_filename, **options)
+        with open(csv_filename, 'rb') as csv_file, open(pickle_filename, 'rb') as pickle_file:
+            return csv_file.read(), pickle_file.read()
+
+    def assertSameOutput(self, output):
+        # Compared line by line: a failing assertEqual on the whole files would diff megabytes of text
+        for name, actual, expected in zip(("CSV", "pickle"), output, self.expected):
+            for number, (actual_line, expected_line) in enumerate(zip(actual.splitlines(), expected.splitlines())):
+                if actual_line != expected_line:
+                    column = len(os.path.commonprefix([actual_line, expected_line]))
+                    self.fail(f"{name} output differs at line {number + 1}, byte {column}: "
+                              f"{actual_line[column:column + 60]!r} != {expected_line[column:column + 60]!r}")
+            self.assertEqual(len(actual), len(expected), f"{name} output has a different length")
+
+    def test_jobs(self):
+        self.assertSameOutput(self.convert("jobs", jobs=2))
+        # Without an index file the dump is decoded here, and nothing is written next to it
+        self.assertFalse(os.path.exists(JSONToCSV.index_filename(self.json_filename)))
+
+    def test_jobs_by_byte_range(self):
+        index_file = os.path.join(self.directory, "ranges", "corpus.index.sqlite")
+        os.makedirs(os.path.dirname(index_file))
+        # The first run has a worker build the index, the second reads through it
+        self.assertSameOutput(self.convert("ranges_first", jobs=2, index_file=index_file))
+        self.assertTrue(os.path.exists(index_file))
+        self.assertSameOutput(self.convert("ranges_second", jobs=2, index_file=index_file))
+
+    def test_jobs_from_an_open_file(self):
+        # Decoded in this process and sent to the workers, instead of read by byte range
+        with open(self.json_filename, 'r', encoding='utf-8') as json_file:
+            self.assertSameOutput(self.convert("jobs_open_file", json_file, jobs=2))
+
+    def test_incremental(self):
+        manifest_file = os.path.join(self.directory, "corpus.manifest.sqlite")
+        # The first run extracts every PR, the second reuses them all from the manifest
+        self.assertSameOutput(self.convert("incremental_first", manifest_file=manifest_file))
+        self.assertSameOutput(self.convert("incremental_second", manifest_file=manifest_file))
+
+    def test_incremental_after_a_change(self):
+        changed_filename = os.path.join(self.directory, "changed.json")
+        manifest_file = os.path.join(self.directory, "changed.manifest.sqlite")
+        with open(self.json_filename, 'r', encoding='utf-8') as json_file:
+            prs = json.load(json_file)
+        # An older dump: every third PR had another title, and the last one was not there yet
+        older = {pr_id: dict(pr, title="old title") if number % 3 == 0 else pr
+                 for number, (pr_id, pr) in enumerate(list(prs.items())[:-1])}
+        with open(changed_filename, 'w', encoding='utf-8') as out:
+            out.write("{" + ",\n".join(f"{json.dumps(pr_id)}: {json.dumps(pr)}" for pr_id, pr in older.items()) + "}\n")
+        self.convert("changed_before", changed_filename, manifest_file=manifest_file)
+        shutil.copyfile(self.json_filename, changed_filename)
+        # Two thirds of the PRs are reused from the manifest and the others extracted again, in file order
+        self.assertSameOutput(self.convert("changed_after", changed_filename, jobs=2, manifest_file=manifest_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONToCSV
+
+# Values that are hard to split across chunks: numbers with fractions and exponents, escapes, non-ASCII text,
+# nested objects and whitespace between the tokens
+DOCUMENTS = [
+    '{}',
+    '{"a": -2.5e10}',
+    '{"a": 12345, "b": 1.0E+5, "c": -0, "d": 0.125}',
+    '{"a": [1, 2.5, true, false, null], "b": "x"}',
+    '{ "1" : {"title": "caf\\u00e9 \\"quoted\\"", "body": "line\\nbreak"} ,\r\n "2": {"title": "ü"} }',
+    '{"x": {"y": {"z": [{"w": 1e-3}]}}, "é": "\\ud83d\\ude00"}',
+]
+
+
+class IterJsonObjectTest(unittest.TestCase):
+    """iter_json_object has to decode the same entries as json.loads, whatever the chunk size."""
+
+    def test_tiny_chunks_match_json_loads(self):
+        for document in DOCUMENTS:
+            expected = list(json.loads(document).items())
+            for chunk_size in range(1, 8):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    entries = list(JSONToCSV.iter_json_object(io.StringIO(document), chunk_size=chunk_size))
+                    self.assertEqual(entries, expected)
+
+    def test_errors_are_reported_at_their_file_position(self):
+        document = '{"a":\n  {"b": 1,\n "c": tru }}'
+        with self.assertRaises(json.JSONDecodeError) as expected:
+            json.loads(document)
+        for chunk_size in (1, 3, 7, 100):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(json.JSONDecodeError) as raised:
+                    list(JSONToCSV.iter_json_object(io.StringIO(document), chunk_size=chunk_size))
+                self.assertEqual(str(raised.exception), str(expected.exception))
+
+    def test_repeated_ids_get_a_row_each_and_are_reported(self):
+        document = '{"3": {"title": "ok"}, "3": {"title": "dup"}}'
+        self.assertEqual([pr["title"] for _, pr in JSONToCSV.iter_json_object(io.StringIO(document))],
+                         ["ok", "dup"])
+        with tempfile.TemporaryDirectory() as directory:
+            csv_filename = os.path.join(directory, "dup.csv")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                JSONToCSV.convert_file(io.StringIO(document), csv_filename, os.path.join(directory, "dup.pkl"))
+        self.assertIn("entry 3 appears more than once", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()